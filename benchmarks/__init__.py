@@ -0,0 +1,2 @@
+# Benchmarks for django_ormsgpack against pickle and json.  Run them with
+# `python -m benchmarks`, see `benchmarks/__main__.py` for the options.
@@ -0,0 +1,60 @@
+"""
+Run the benchmarks:
+
+    python -m benchmarks [--case narrow] [--codec ormsgpack] [--save results.json]
+                         [--baseline benchmarks/baseline.json] [--tolerance 0.2]
+                         [--bytes-only]
+
+Exits with status 1 if any result regressed against the baseline.
+`benchmarks/baseline.json` is the stored one, recorded with `--save`; its
+throughput figures only hold on the machine that recorded them, so elsewhere
+compare with `--bytes-only`.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import django
+
+
+def main() -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    from .cases import CASES, CODECS
+    from .runner import compare, format_results, run
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--case", action="append", choices=sorted(CASES))
+    parser.add_argument("--codec", action="append", choices=sorted(CODECS))
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with results saved earlier.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--bytes-only",
+        action="store_true",
+        help="Only compare payload sizes, for baselines from other machines.",
+    )
+    args = parser.parse_args()
+
+    results = run(args.case, args.codec, args.min_time)
+    print(format_results(results))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(
+                results, json.load(f), args.tolerance, not args.bytes_only
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Values to benchmark, and the codecs to benchmark them with.
+"""
+
+import json
+import pickle  # nosec
+from datetime import date, time, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from uuid import uuid4
+
+from django.contrib.sessions import serializers as session_serializers
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signing import JSONSerializer
+from django.db.models import Model
+from django.utils import timezone
+
+from django_ormsgpack.compression import (
+    deserialize_compressed,
+    serialize_compressed,
+    train_dictionary,
+)
+from django_ormsgpack.registry import CLASS_TO_ID, ID_TO_ZDICT
+from django_ormsgpack.serializer import deserialize, serialize
+from django_ormsgpack.sessions import OrmsgpackSerializer
+from my_app.models import ATestModel, BTestModel, CTestModel, Ticket, WideModel
+
+BULK_SIZE = 1000
+DICTIONARY_SAMPLES = 200
+
+
+class Codec(NamedTuple):
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def make_a() -> ATestModel:
+    return ATestModel(
+        id=uuid4(),
+        char_field="Coolio",
+        date_field=timezone.now(),
+        decimal_field=Decimal("20.22"),
+        int_field=123,
+        zorg=uuid4(),
+        zorg2=uuid4(),
+    )
+
+
+def make_b() -> BTestModel:
+    return BTestModel(
+        id=uuid4(),
+        char_field="Coolio",
+        date_field=timezone.now(),
+        decimal_field=Decimal("20.22"),
+        int_field=123,
+        zorg=uuid4(),
+        zorg2=uuid4(),
+    )
+
+
+def make_c() -> CTestModel:
+    return CTestModel(
+        id=1234567,
+        char_field="Coolio",
+        date_field=timezone.now(),
+        decimal_field=Decimal("20.22"),
+        int_field=123,
+        zorg=uuid4(),
+        zorg2=uuid4(),
+    )
+
+
+def make_ticket() -> Ticket:
+    screening = make_b()
+    return Ticket(
+        screening=screening,
+        user=screening,
+        purchaser=make_c(),
+        cnt_feature_views=12345,
+        cnt_preroll_views=435212,
+        cnt_postroll_views=23423,
+        viewing_open_time=timezone.now(),
+        viewing_close_time=timezone.now(),
+    )
+
+
+def make_wide() -> WideModel:
+    return WideModel(
+        id=987654321,
+        char_field="Coolio",
+        text_field="A somewhat longer text value " * 4,
+        slug_field="a-slug",
+        email_field="someone@example.com",
+        url_field="https://example.com/some/path",
+        int_field=123,
+        big_int_field=2**40,
+        small_int_field=12,
+        positive_int_field=34567,
+        float_field=3.14159,
+        bool_field=True,
+        decimal_field=Decimal("1234.56"),
+        datetime_field=timezone.now(),
+        date_field=date(2021, 7, 4),
+        time_field=time(12, 34, 56),
+        uuid_field=uuid4(),
+        ip_field="192.168.1.1",
+        json_field={"a": [1, 2, 3], "b": {"c": "d"}},
+        binary_field=b"\x00\x01\x02\x03" * 8,
+        duration_field=timedelta(days=1, seconds=5, microseconds=7),
+        file_field="uploads/report.pdf",
+        ticket_id=uuid4(),
+    )
+
+
+def make_mixed() -> list:
+    return [
+        {
+            "sauce": 12345,
+            "x": 94322,
+            "rightnow": timezone.now(),
+            "1234": "awesome",
+            "nested": [make_b(), make_c()],
+        },
+        make_ticket(),
+    ]
+
+
+def make_session() -> dict:
+    "A typical session of a logged-in user, as the JSON serializer allows."
+    return {
+        "_auth_user_id": "12345",
+        "_auth_user_backend": "django.contrib.auth.backends.ModelBackend",
+        "_auth_user_hash": "3f2a" * 16,
+        "_session_expiry": 1209600,
+        "cart": [{"sku": f"SKU-{idx}", "quantity": idx} for idx in range(5)],
+        "django_language": "en",
+    }
+
+
+def make_rich_session() -> dict:
+    "A session holding values that the JSON serializer can't."
+    session = make_session()
+    session.update(last_seen=timezone.now(), token=uuid4(), total=Decimal("99.95"))
+    session["ticket"] = make_ticket()
+    return session
+
+
+# Each case is built once, then encoded and decoded repeatedly.
+CASES: Dict[str, Callable[[], Any]] = {
+    "narrow": make_a,
+    "wide": make_wide,
+    "nested_fks": make_ticket,
+    "bulk_tickets": lambda: [make_ticket() for _ in range(BULK_SIZE)],
+    "mixed": make_mixed,
+    "session": make_session,
+    "rich_session": make_rich_session,
+}
+
+
+def _django_json_encode(val: Any) -> bytes:
+    models: List[Model] = val if isinstance(val, list) else [val]
+    return serializers.serialize("json", models).encode()
+
+
+def _django_json_decode(val: bytes) -> Any:
+    return [obj.object for obj in serializers.deserialize("json", val)]
+
+
+def _is_models(val: Any) -> bool:
+    if isinstance(val, list):
+        return all(isinstance(item, Model) for item in val)
+    return isinstance(val, Model)
+
+
+def json_codec(make: Callable[[], Any], val: Any) -> Optional[Codec]:
+    "Django's JSON serializer for models, `json` with `DjangoJSONEncoder` otherwise."
+    if _is_models(val):
+        return Codec(_django_json_encode, _django_json_decode)
+    try:
+        json.dumps(val, cls=DjangoJSONEncoder)
+    except TypeError:
+        return None
+    return Codec(
+        lambda val: json.dumps(val, cls=DjangoJSONEncoder).encode(), json.loads
+    )
+
+
+def compressed_codec(make: Callable[[], Any], val: Any) -> Optional[Codec]:
+    "`compression` with a dictionary trained on more values like `val`."
+    class_id = CLASS_TO_ID.get(type(val))
+    if class_id is not None and class_id not in ID_TO_ZDICT:
+        ID_TO_ZDICT[class_id] = train_dictionary(
+            serialize(make()) for _ in range(DICTIONARY_SAMPLES)
+        )
+    return Codec(serialize_compressed, deserialize_compressed)
+
+
+def session_codec(serializer_class: Any) -> Callable[..., Optional[Codec]]:
+    "A `SESSION_SERIALIZER` class, for session dicts only."
+
+    def factory(make: Callable[[], Any], val: Any) -> Optional[Codec]:
+        if serializer_class is None or not isinstance(val, dict):
+            return None
+        serializer = serializer_class()
+        try:
+            serializer.dumps(val)
+        except TypeError:
+            return None
+        return Codec(serializer.dumps, serializer.loads)
+
+    return factory
+
+
+# Codec factories get the case factory and the value, and return None for
+# values the codec can't handle.
+CODECS: Dict[str, Callable[[Callable[[], Any], Any], Optional[Codec]]] = {
+    "ormsgpack": lambda make, val: Codec(serialize, deserialize),
+    "ormsgpack_zdict": compressed_codec,
+    "pickle": lambda make, val: Codec(pickle.dumps, pickle.loads),  # nosec
+    "json": json_codec,
+    "session_ormsgpack": session_codec(OrmsgpackSerializer),
+    "session_json": session_codec(JSONSerializer),
+    # Removed in Django 5.0.
+    "session_pickle": session_codec(
+        getattr(session_serializers, "PickleSerializer", None)
+    ),
+}
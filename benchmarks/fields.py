@@ -0,0 +1,95 @@
+"""
+Per-field-type benchmark matrix, over the fields of `WideModel`:
+
+    python -m benchmarks.fields [--count 1000]
+
+For each field, the cost of its generated encode and decode statements, net of
+the profiling timers, next to the cost of decoding the same value with the
+generic `Field.to_python`.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from time import perf_counter_ns
+from typing import Any, Dict, List
+
+import django
+
+
+def timer_overhead(count: int) -> int:
+    "Nanoseconds that the profiling builds add to each field, roughly."
+    timings = [0]
+    start = perf_counter_ns()
+    for _ in range(count):
+        end = perf_counter_ns()
+        timings[0] += end - start
+        start = end
+    return timings[0] // count
+
+
+def field_matrix(count: int = 1000) -> List[Dict[str, Any]]:
+    import ormsgpack
+
+    from django_ormsgpack.profiling import profile_fields
+    from my_app.models import WideModel
+
+    from .cases import make_wide
+
+    instances = [make_wide() for _ in range(count)]
+    costs = {cost.name: cost for cost in profile_fields(WideModel, instances)}
+    fields = WideModel.get_serializer_fields()
+    values = ormsgpack.unpackb(ormsgpack.packb(instances[0].to_tuple()))
+    overhead = timer_overhead(count)
+    instance = WideModel()
+    rows = []
+    for field, value in zip(fields, values):
+        cost = costs[field.name]
+
+        def generic() -> None:
+            setattr(instance, field.attname, field.to_python(value))
+
+        try:
+            to_python_ns: Any = int(timeit.timeit(generic, number=count) * 1e9 / count)
+        except Exception:
+            # The generic path cannot read our encoding of this type at all.
+            to_python_ns = None
+        rows.append(
+            {
+                "field": field.name,
+                "type": type(field).__name__,
+                "encode_ns": max(cost.encode_ns // count - overhead, 0),
+                "decode_ns": max(cost.decode_ns // count - overhead, 0),
+                "to_python_ns": to_python_ns,
+            }
+        )
+    return rows
+
+
+def format_matrix(rows: List[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'field':<22} {'type':<24} {'encode ns':>10} {'decode ns':>10} "
+        f"{'to_python ns':>13}"
+    ]
+    for row in rows:
+        to_python_ns = "-" if row["to_python_ns"] is None else row["to_python_ns"]
+        lines.append(
+            f"{row['field']:<22} {row['type']:<24} {row['encode_ns']:>10} "
+            f"{row['decode_ns']:>10} {to_python_ns:>13}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fields")
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+    print(format_matrix(field_matrix(args.count)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Requests per second and response bytes of a ticket list rendered by DRF's
+`JSONRenderer` against `MsgpackRenderer` and `MsgpackStreamingResponse`:
+
+    python -m benchmarks.http [--count 100]
+"""
+
+import argparse
+import os
+
+import django
+
+
+def main() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    from django_ormsgpack.renderers import MEDIA_TYPE
+
+    from .runner import ops_per_second
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.http")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    client = Client()
+    requests = {
+        "json": lambda: client.get(
+            f"/tickets/?count={args.count}", HTTP_ACCEPT="application/json"
+        ).content,
+        "msgpack": lambda: client.get(
+            f"/tickets/?count={args.count}", HTTP_ACCEPT=MEDIA_TYPE
+        ).content,
+        "msgpack_stream": lambda: b"".join(
+            client.get(f"/tickets/stream/?count={args.count}").streaming_content
+        ),
+    }
+    for name, request in requests.items():
+        print(
+            f"{name:<16} {ops_per_second(request, args.min_time):>8.0f} req/s "
+            f"{len(request()):>8} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Throughput of `serialize_queryset` and `deserialize_many` against the number of
+worker processes, on a throwaway SQLite database of `WideModel` rows:
+
+    python -m benchmarks.parallel [--values 100000] [--workers 1 2 4 8]
+
+The workers fetch and serialize the rows themselves, and decode the blobs sent
+to them, so only primary keys and blobs cross to the workers.  The decoded
+instances are pickled back to this process, which bounds `deserialize_many`.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional
+
+import django
+
+
+def create_rows(path: str, count: int) -> None:
+    "Create the tables of my_app in a SQLite database at `path`, and the rows."
+    from django.apps import apps
+    from django.db import connection
+
+    from my_app.models import WideModel
+
+    from .cases import make_wide
+
+    connection.close()
+    connection.settings_dict["NAME"] = path
+    with connection.schema_editor() as editor:
+        for model in dict.fromkeys(
+            model._meta.concrete_model
+            for model in apps.get_app_config("my_app").get_models()
+        ):
+            editor.create_model(model)
+    rows = []
+    for _ in range(count):
+        row = make_wide()
+        row.id = row.ticket_id = None
+        rows.append(row)
+    WideModel.objects.bulk_create(rows, batch_size=500)
+
+
+def rate(
+    label: str,
+    count: int,
+    run: Callable[[Optional[ProcessPoolExecutor], int], Iterator[Any]],
+    workers: List[int],
+) -> None:
+    "Print the values per second `run` yields in process and with `workers`."
+    from django_ormsgpack.parallel import initialize_worker
+
+    start = time.perf_counter()
+    for _ in run(None, 1):
+        pass
+    print(f"{label} in process: {count / (time.perf_counter() - start):.0f}/s")
+
+    for worker_count in workers:
+        # Forked, so that the workers use the database created here.
+        with ProcessPoolExecutor(
+            worker_count,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=initialize_worker,
+        ) as executor:
+            start = time.perf_counter()
+            for _ in run(executor, worker_count):
+                pass
+            elapsed = time.perf_counter() - start
+        print(f"{label} {worker_count} workers: {count / elapsed:.0f}/s")
+
+
+def main() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    from django_ormsgpack.parallel import deserialize_many, serialize_queryset
+    from my_app.models import WideModel
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parallel")
+    parser.add_argument("--values", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_rows(os.path.join(directory, "db.sqlite3"), args.values)
+        queryset = WideModel.objects.order_by("pk")
+        rate(
+            "serialize_queryset",
+            args.values,
+            lambda executor, workers: serialize_queryset(
+                queryset, executor, args.chunk_size, workers=workers
+            ),
+            args.workers,
+        )
+        blobs = list(serialize_queryset(queryset, chunk_size=args.chunk_size))
+        rate(
+            "deserialize_many",
+            args.values,
+            lambda executor, workers: deserialize_many(
+                blobs, executor, args.chunk_size, workers=workers
+            ),
+            args.workers,
+        )
+
+
+if __name__ == "__main__":
+    main()
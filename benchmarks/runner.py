@@ -0,0 +1,126 @@
+"""
+Measure codecs on the benchmark cases, and compare results with a baseline.
+"""
+
+import platform
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import django
+import ormsgpack
+
+from .cases import CASES, CODECS
+
+REPEAT = 3
+
+# Only our own codecs are checked for regressions; pickle and json are there
+# for reference.
+CHECKED_CODECS = ("ormsgpack", "ormsgpack_zdict", "session_ormsgpack")
+# How much payloads may grow: compressed sizes vary by a few bytes with the
+# random ids and current times of the cases.
+BYTES_TOLERANCE = {"ormsgpack_zdict": 0.02}
+
+
+def ops_per_second(fn: Callable[[], Any], min_time: float) -> float:
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = min([elapsed] + timer.repeat(REPEAT - 1, number))
+    return number / best
+
+
+def allocated_bytes(fn: Callable[[], Any]) -> int:
+    "Peak memory allocated by a single call of `fn`."
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(
+    cases: Optional[Iterable[str]] = None,
+    codecs: Optional[Iterable[str]] = None,
+    min_time: float = 0.2,
+) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for case_name in cases or CASES:
+        make = CASES[case_name]
+        val = make()
+        results[case_name] = {}
+        for codec_name in codecs or CODECS:
+            codec = CODECS[codec_name](make, val)
+            if codec is None:
+                continue
+            blob = codec.encode(val)
+            codec.decode(blob)
+            results[case_name][codec_name] = {
+                "encode_ops": ops_per_second(lambda: codec.encode(val), min_time),
+                "decode_ops": ops_per_second(lambda: codec.decode(blob), min_time),
+                "bytes": len(blob),
+                "encode_alloc": allocated_bytes(lambda: codec.encode(val)),
+                "decode_alloc": allocated_bytes(lambda: codec.decode(blob)),
+            }
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "ormsgpack": ormsgpack.__version__,
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2,
+    throughput: bool = True,
+) -> List[str]:
+    """
+    Return a description of each regression of `results` against `baseline`:
+    throughput that dropped by more than `tolerance`, or payloads that grew.
+
+    :param throughput: Compare throughput as well as payload sizes, which only
+                       makes sense against a baseline from the same machine.
+    """
+    regressions = []
+    for case_name, codecs in results["results"].items():
+        for codec_name in CHECKED_CODECS:
+            try:
+                current = codecs[codec_name]
+                previous = baseline["results"][case_name][codec_name]
+            except KeyError:
+                continue
+            for metric in ("encode_ops", "decode_ops") if throughput else ():
+                if current[metric] < previous[metric] * (1 - tolerance):
+                    regressions.append(
+                        f"{case_name}/{codec_name} {metric}: "
+                        f"{current[metric]:.0f} < {previous[metric]:.0f}"
+                    )
+            slack = BYTES_TOLERANCE.get(codec_name, 0)
+            if current["bytes"] > previous["bytes"] * (1 + slack):
+                regressions.append(
+                    f"{case_name}/{codec_name} bytes: "
+                    f"{current['bytes']} > {previous['bytes']}"
+                )
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [
+        f"{'case':<14} {'codec':<16} {'encode/s':>10} {'decode/s':>10} "
+        f"{'bytes':>8} {'enc alloc':>10} {'dec alloc':>10}"
+    ]
+    for case_name, codecs in results["results"].items():
+        for codec_name, row in codecs.items():
+            lines.append(
+                f"{case_name:<14} {codec_name:<16} {row['encode_ops']:>10.0f} "
+                f"{row['decode_ops']:>10.0f} {row['bytes']:>8} "
+                f"{row['encode_alloc']:>10} {row['decode_alloc']:>10}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""
+Measure the cold start cost of django_ormsgpack:
+
+    python -m benchmarks.startup [--repeat 5]
+
+Each run is a fresh interpreter under `python -X importtime`, which boots Django,
+imports the serializer, then round-trips a datetime.  Reported are the import
+time of each django_ormsgpack module, the boot time, and the time of that first
+round trip.  Exits with status 1 if the package imports take longer than
+`IMPORT_BUDGET_MS`.
+"""
+
+import argparse
+import json
+import subprocess  # nosec
+import sys
+from os import path
+from typing import Any, Dict, List
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+PACKAGE = "django_ormsgpack"
+# Around 20ms on a laptop, with room for slower machines.
+IMPORT_BUDGET_MS = 50
+
+SCRIPT = """
+import json, os, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+start = time.perf_counter()
+import django
+django.setup()
+from django.utils import timezone
+from django_ormsgpack import serializer, serializer_fns
+booted = time.perf_counter()
+loaded_zones = len(serializer_fns.TZ_VAL)
+serializer.deserialize(serializer.serialize(timezone.now()))
+print(json.dumps({
+    "boot_ms": (booted - start) * 1000,
+    "first_datetime_ms": (time.perf_counter() - booted) * 1000,
+    "zones_loaded_at_boot": loaded_zones,
+}))
+"""
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    "Microseconds spent in each module, excluding its imports."
+    times = {}
+    for line in output.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def measure() -> Dict[str, Any]:
+    "Boot a fresh interpreter and time it."
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    result: Dict[str, Any] = json.loads(process.stdout)
+    result["modules_us"] = {
+        name: us
+        for name, us in parse_importtime(process.stderr).items()
+        if name.split(".")[0] == PACKAGE
+    }
+    result["package_import_ms"] = sum(result["modules_us"].values()) / 1000
+    return result
+
+
+def best(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    "The fastest of several runs, by package import time."
+    return min(results, key=lambda result: result["package_import_ms"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = best([measure() for _ in range(args.repeat)])
+    for name, us in sorted(
+        result["modules_us"].items(), key=lambda item: item[1], reverse=True
+    ):
+        print(f"{name:<40} {us / 1000:>8.2f} ms")
+    print(f"{'package imports':<40} {result['package_import_ms']:>8.2f} ms")
+    print(f"{'django.setup() and imports':<40} {result['boot_ms']:>8.2f} ms")
+    print(f"{'first datetime round trip':<40} {result['first_datetime_ms']:>8.2f} ms")
+    return 1 if result["package_import_ms"] > IMPORT_BUDGET_MS else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Decode throughput against the number of threads, with the registry frozen:
+
+    python -m benchmarks.threads [--count 20000] [--threads 1 2 4 8] [--case nested_fks]
+
+With the GIL, threads share one core and throughput stays flat.  On a
+free-threaded build it should grow with the threads, as decoding only reads
+the registry.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+import django
+
+
+def decode_scaling(
+    threads: Sequence[int] = (1, 2, 4, 8),
+    count: int = 20000,
+    case: str = "nested_fks",
+) -> List[Dict[str, Any]]:
+    "Values decoded per second by each number of threads, `count` each."
+    from django_ormsgpack.registry import freeze
+    from django_ormsgpack.serializer import deserialize, serialize
+
+    from .cases import CASES
+
+    freeze()
+    blob = serialize(CASES[case]())
+    deserialize(blob)
+    rows: List[Dict[str, Any]] = []
+    for thread_count in threads:
+        barrier = threading.Barrier(thread_count + 1)
+
+        def work() -> None:
+            barrier.wait()
+            for _ in range(count):
+                deserialize(blob)
+
+        workers = [threading.Thread(target=work) for _ in range(thread_count)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        ops = thread_count * count / (time.perf_counter() - start)
+        rows.append(
+            {
+                "threads": thread_count,
+                "ops": ops,
+                "speedup": ops / rows[0]["ops"] if rows else 1.0,
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    from .cases import CASES
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.threads")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--case", choices=sorted(CASES), default="nested_fks")
+    args = parser.parse_args()
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}")
+    for row in decode_scaling(args.threads, args.count, args.case):
+        print(f"{row['threads']} threads: {row['ops']:.0f}/s ({row['speedup']:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,20 @@
 __version__ = "0.1.0"
-from .model import *
-from .registry import serializable_model
+from importlib import import_module
+from typing import Any
+
+from .registry import serializable, serializable_model
+
+# `model` defines an abstract Django model, which can only happen once the app
+# registry is loaded, so its names are resolved on first access rather than when
+# Django imports this package from INSTALLED_APPS.
+_MODEL_EXPORTS = {
+    "SerializableModel",
+    "SerializationError",
+    "SerializationProgrammingError",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _MODEL_EXPORTS:
+        return getattr(import_module(".model", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
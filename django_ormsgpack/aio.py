@@ -0,0 +1,138 @@
+"""
+Async helpers for ASGI views.
+
+Values are stored in the cache as `serializer.serialize` payloads.  Payloads of
+`OFFLOAD_THRESHOLD` bytes or more are decoded on a bounded thread pool rather
+than on the event loop, and large lists can be consumed a batch at a time with
+`aiter_deserialize`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional
+
+import ormsgpack
+from asgiref.sync import sync_to_async
+from django.core.cache import BaseCache
+from django.core.cache import cache as default_cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .serializer import _unwrap, deserialize, serialize
+from .serializer_fns import MODEL, TZ, UUID_IDENTIFIER
+
+OFFLOAD_THRESHOLD = 16 * 1024
+OFFLOAD_COUNT = 16
+MAX_WORKERS = 4
+BATCH_SIZE = 100
+
+_TAGS = (MODEL, TZ, UUID_IDENTIFIER)
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    "The thread pool that large payloads are decoded on."
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            MAX_WORKERS, thread_name_prefix="django_ormsgpack"
+        )
+    return _EXECUTOR
+
+
+async def _cache_call(cache: Optional[BaseCache], name: str, *args: Any) -> Any:
+    cache = cache or default_cache
+    # Django 4.0 added native async methods to the cache API.
+    method = getattr(cache, f"a{name}", None)
+    if method is None:
+        method = sync_to_async(getattr(cache, name))
+    return await method(*args)
+
+
+async def adeserialize(val: bytes, threshold: int = OFFLOAD_THRESHOLD) -> Any:
+    "`deserialize`, on the thread pool if `val` is `threshold` bytes or more."
+    if len(val) < threshold:
+        return deserialize(val)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_executor(), deserialize, val
+    )
+
+
+def _unwrap_batch(batch: List[Any]) -> List[Any]:
+    return [_unwrap(item) for item in batch]
+
+
+async def aiter_deserialize(
+    val: bytes, batch_size: int = BATCH_SIZE
+) -> AsyncIterator[Any]:
+    """
+    Decode a serialized list on the thread pool `batch_size` items at a time,
+    yielding the items.  A payload that is not a list is yielded as one item.
+    """
+    loop = asyncio.get_running_loop()
+    unpacked = await loop.run_in_executor(get_executor(), ormsgpack.unpackb, val)
+    if not isinstance(unpacked, list) or (unpacked and unpacked[0] in _TAGS):
+        yield _unwrap(unpacked)
+        return
+    for start in range(0, len(unpacked), batch_size):
+        batch = await loop.run_in_executor(
+            get_executor(), _unwrap_batch, unpacked[start : start + batch_size]
+        )
+        for item in batch:
+            yield item
+
+
+async def aget_model(
+    key: str, default: Any = None, cache: Optional[BaseCache] = None
+) -> Any:
+    "Fetch and decode the value cached under `key`."
+    val = await _cache_call(cache, "get", key)
+    if val is None:
+        return default
+    return await adeserialize(val)
+
+
+async def aget_many(
+    keys: Iterable[str], cache: Optional[BaseCache] = None
+) -> Dict[str, Any]:
+    "Fetch and decode the values cached under `keys`, skipping missing keys."
+    found: Dict[str, bytes] = await _cache_call(cache, "get_many", list(keys))
+    return {key: await adeserialize(val) for key, val in found.items()}
+
+
+async def aget_iter(
+    key: str, batch_size: int = BATCH_SIZE, cache: Optional[BaseCache] = None
+) -> AsyncIterator[Any]:
+    "Fetch the list cached under `key` and yield its decoded items."
+    val = await _cache_call(cache, "get", key)
+    if val is not None:
+        async for item in aiter_deserialize(val, batch_size):
+            yield item
+
+
+def _serialize_mapping(mapping: Mapping[str, Any]) -> Dict[str, bytes]:
+    return {key: serialize(val) for key, val in mapping.items()}
+
+
+async def aset_many(
+    mapping: Mapping[str, Any],
+    timeout: Any = DEFAULT_TIMEOUT,
+    cache: Optional[BaseCache] = None,
+) -> List[str]:
+    """
+    Serialize and cache the values of `mapping`, on the thread pool if there
+    are `OFFLOAD_COUNT` of them or more.  Returns the keys that failed to be
+    inserted, like `cache.set_many`.
+    """
+    if len(mapping) < OFFLOAD_COUNT:
+        serialized = _serialize_mapping(mapping)
+    else:
+        serialized = await asyncio.get_running_loop().run_in_executor(
+            get_executor(), _serialize_mapping, mapping
+        )
+    failed: Optional[List[str]] = await _cache_call(
+        cache, "set_many", serialized, timeout
+    )
+    return failed or []
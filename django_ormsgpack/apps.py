@@ -0,0 +1,26 @@
+from importlib.util import find_spec
+from os import path
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class OrmsgpackConfig(AppConfig):
+    name = "django_ormsgpack"
+    verbose_name = "Django ormsgpack"
+
+    def ready(self) -> None:
+        from .compression import get_dictionary_path, load_dictionaries
+
+        dictionary_path = get_dictionary_path()
+        if dictionary_path and path.exists(dictionary_path):
+            load_dictionaries(dictionary_path)
+
+        if find_spec("channels_redis"):
+            # Registers the "ormsgpack" serializer_format of channels_redis.
+            from . import channel_layers  # noqa: F401
+
+        if getattr(settings, "ORMSGPACK_FREEZE_REGISTRY", False):
+            from .registry import freeze
+
+            freeze()
@@ -0,0 +1,224 @@
+"""
+Channel layer messages encoded with `serializer.serialize`, so that they can
+carry model instances and the other classes it supports.
+
+`OrmsgpackMessageSerializer` is a channels_redis message serializer, which
+channels_redis 4.1 and later use with `"serializer_format": "ormsgpack"`.
+`OrmsgpackLayerMixin` puts it in place of the `serialize`/`deserialize` of a
+layer such as channels_redis's `RedisChannelLayer`, and can share encodings
+between the copies of a group message, and
+`OrmsgpackInMemoryChannelLayer` runs every message through it in process, which
+is what tests want.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import random
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional, Tuple, Union
+
+import ormsgpack
+
+from .serializable import Serializable
+from .serializer import deserialize, map_header, serialize
+
+try:
+    from channels.layers import InMemoryChannelLayer
+except ImportError:  # Django Channels is optional.
+    InMemoryChannelLayer = object
+
+try:
+    from channels_redis.serializers import BaseMessageSerializer, registry
+except ImportError:  # channels_redis older than 4.1, or not installed.
+    BaseMessageSerializer = object
+    registry = None
+
+# The `serializer_format` of channels_redis layers for these messages.
+SERIALIZER_FORMAT = "ormsgpack"
+# channels_redis keeps messages in sorted sets, where they need to be unique.
+RANDOM_PREFIX_LENGTH = 12
+PAYLOAD = "__ormsgpack__"
+# Added by channels_redis to the copy of a group message for each connection.
+CHANNEL = "__asgi_channel__"
+
+# Values worth sharing between the messages of a broadcast.
+_SHARED_TYPES = (dict, list, tuple, Serializable)
+
+Signature = FrozenSet[Tuple[str, int]]
+
+
+def _signature(message: Dict[str, Any]) -> Signature:
+    "What the copies of a group message have in common: the same values."
+    return frozenset((key, id(val)) for key, val in message.items() if key != CHANNEL)
+
+
+def make_crypter(keys: Iterable[Union[str, bytes]]) -> Any:
+    "A `MultiFernet` of `keys`, derived as channels_redis derives them."
+    try:
+        from cryptography.fernet import Fernet, MultiFernet
+    except ImportError:
+        raise ValueError("Cannot run with encryption without 'cryptography' installed.")
+
+    fernets = []
+    for key in keys:
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        fernets.append(Fernet(base64.urlsafe_b64encode(hashlib.sha256(key).digest())))
+    return MultiFernet(fernets)
+
+
+class OrmsgpackMessageSerializer(BaseMessageSerializer):
+    """
+    Encodes channel layer messages, which are dicts with string keys.
+
+    :param symmetric_encryption_keys: Keys to encrypt messages with, the first
+                                      one, and to decrypt them with, any one.
+    :param random_prefix_length: Random bytes to start each message with.
+    :param expiry: Seconds that encrypted messages are valid for, less ten.
+    :param registered_only: Only decode instances of registered classes, and
+                            never import a class named in a message.
+    :param share_references: Within `fan_out`, encode the values of a group
+                             message once for all of its copies, which some
+                             layers make for each channel.
+    """
+
+    def __init__(
+        self,
+        symmetric_encryption_keys: Optional[Iterable[Union[str, bytes]]] = None,
+        random_prefix_length: int = 0,
+        expiry: Optional[int] = None,
+        *,
+        registered_only: bool = True,
+        share_references: bool = False,
+    ) -> None:
+        if isinstance(symmetric_encryption_keys, (str, bytes)):
+            raise ValueError(
+                "symmetric_encryption_keys must be a list of possible keys"
+            )
+        self.random_prefix_length = random_prefix_length
+        self.expiry = expiry
+        self.crypter = (
+            make_crypter(symmetric_encryption_keys)
+            if symmetric_encryption_keys
+            else None
+        )
+        self.registered_only = registered_only
+        self.share_references = share_references
+        # Encoded values of the group messages being sent, by id.
+        self._fan_outs: Dict[Signature, Dict[int, bytes]] = {}
+
+    @contextmanager
+    def fan_out(self, message: Dict[str, Any]) -> Iterator[None]:
+        """
+        Share the encoding of the values of `message` between its copies
+        serialized in this block, which must not change them.
+        """
+        signature = _signature(message)
+        self._fan_outs[signature] = {}
+        try:
+            yield
+        finally:
+            self._fan_outs.pop(signature, None)
+
+    def as_bytes(self, message: Dict[str, Any]) -> bytes:
+        shared = (
+            self._fan_outs.get(_signature(message)) if self.share_references else None
+        )
+        if shared is None:
+            return serialize(message)
+        parts = [map_header(len(message))]
+        for key, val in message.items():
+            parts.append(ormsgpack.packb(key))
+            if key == CHANNEL or not isinstance(val, _SHARED_TYPES):
+                parts.append(serialize(val))
+                continue
+            # The message passed to `fan_out` keeps the values, and their ids,
+            # alive.
+            if id(val) not in shared:
+                shared[id(val)] = serialize(val)
+            parts.append(shared[id(val)])
+        return b"".join(parts)
+
+    def from_bytes(self, message: bytes) -> Dict[str, Any]:
+        return deserialize(message, registered_only=self.registered_only)
+
+    def serialize(self, message: Dict[str, Any]) -> bytes:
+        value = self.as_bytes(message)
+        if self.crypter:
+            value = self.crypter.encrypt(value)
+        if self.random_prefix_length:
+            prefix = random.getrandbits(8 * self.random_prefix_length)  # nosec
+            return prefix.to_bytes(self.random_prefix_length, "big") + value
+        return value
+
+    def deserialize(self, message: bytes) -> Dict[str, Any]:
+        message = message[self.random_prefix_length :]
+        if self.crypter:
+            ttl = None if self.expiry is None else self.expiry + 10
+            message = self.crypter.decrypt(message, ttl)
+        return self.from_bytes(message)
+
+
+if registry is not None:
+    registry.register_serializer(SERIALIZER_FORMAT, OrmsgpackMessageSerializer)
+
+
+class OrmsgpackLayerMixin:
+    """
+    Encodes the messages of a channel layer with `OrmsgpackMessageSerializer`::
+
+        class OrmsgpackRedisChannelLayer(OrmsgpackLayerMixin, RedisChannelLayer):
+            pass
+
+    and in `CHANNEL_LAYERS`, `"CONFIG": {"share_references": True, ...}`.
+    Messages are encrypted with `symmetric_encryption_keys`, `expiry` and
+    `random_prefix_length` as the layer would, if the layer takes them.
+    """
+
+    random_prefix_length = RANDOM_PREFIX_LENGTH
+
+    def __init__(
+        self,
+        *args: Any,
+        registered_only: bool = True,
+        share_references: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.message_serializer = OrmsgpackMessageSerializer(
+            kwargs.get("symmetric_encryption_keys"),
+            kwargs.get("random_prefix_length", self.random_prefix_length),
+            kwargs.get("expiry", getattr(self, "expiry", None)),
+            registered_only=registered_only,
+            share_references=share_references,
+        )
+
+    def serialize(self, message: Dict[str, Any]) -> bytes:
+        return self.message_serializer.serialize(message)
+
+    def deserialize(self, message: bytes) -> Dict[str, Any]:
+        return self.message_serializer.deserialize(message)
+
+    async def group_send(self, group: str, message: Dict[str, Any]) -> None:
+        with self.message_serializer.fan_out(message):
+            await super().group_send(group, message)  # type: ignore
+
+
+class OrmsgpackInMemoryChannelLayer(OrmsgpackLayerMixin, InMemoryChannelLayer):
+    """
+    The in-memory channel layer of Django Channels, passing messages encoded,
+    so that tests see what other layers would deliver.
+    """
+
+    random_prefix_length = 0
+
+    async def send(self, channel: str, message: Dict[str, Any]) -> None:
+        if not isinstance(message, dict):
+            raise TypeError("message is not a dict")
+        await super().send(channel, {PAYLOAD: self.serialize(message)})
+
+    async def receive(self, channel: str) -> Dict[str, Any]:
+        message = await super().receive(channel)
+        return self.deserialize(message[PAYLOAD])
@@ -0,0 +1,182 @@
+"""
+Optional compression stage around `serializer.serialize`/`deserialize`.
+
+Serialized models are usually too small for zlib to find anything to compress,
+so payloads of registered classes are compressed against a preset dictionary
+(`zdict`) trained from sample payloads of that class.  Every blob starts with a
+header byte naming the codec used for the rest of it.  Dictionary blobs then
+carry the class id and the Adler-32 of the dictionary, as zlib's own DICTID
+does, so that blobs compressed with an older dictionary are refused rather than
+inflated into the wrong bytes.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import ormsgpack
+
+from .model import SerializationError
+from .registry import CLASS_TO_ID, ID_TO_ZDICT
+from .serializer import deserialize, serialize
+
+RAW = 0
+ZLIB = 1
+ZDICT = 2
+
+COMPRESS_THRESHOLD = 96
+COMPRESS_LEVEL = 9
+DICTIONARY_SIZE = 1024
+SEGMENT_LENGTH = 6
+
+# Raw deflate streams: the zlib header and checksum would cost six bytes, which
+# is a lot for a payload of a hundred.
+WBITS = -15
+# A 2KB window and the smaller hash tables of memLevel 4 compress payloads that
+# fit in the window, with their dictionary, as well as the full window does,
+# allocating 55KB rather than 300KB per call.  Inflating with the full window of
+# WBITS reads streams of any window size.
+SMALL_WBITS = -11
+SMALL_MEM_LEVEL = 4
+# Bytes that deflate can refer back to with SMALL_WBITS.
+SMALL_WINDOW = (1 << -SMALL_WBITS) - 262
+ZDICT_HEADER = struct.Struct(">BII")
+
+
+def serialize_compressed(
+    val: Any, threshold: int = COMPRESS_THRESHOLD, level: int = COMPRESS_LEVEL
+) -> bytes:
+    """
+    Serialize `val`, compressing the result if it is at least `threshold` bytes.
+
+    Uses the trained dictionary for the class of `val` when one is loaded, and
+    plain deflate otherwise.  Falls back to storing the payload uncompressed if
+    compression does not make it smaller.
+    """
+    payload = serialize(val)
+    if len(payload) >= threshold:
+        class_id = CLASS_TO_ID.get(type(val))
+        zdict = ID_TO_ZDICT.get(class_id) if class_id is not None else None
+        if len(payload) + len(zdict or b"") <= SMALL_WINDOW:
+            wbits, mem_level = SMALL_WBITS, SMALL_MEM_LEVEL
+        else:
+            wbits, mem_level = WBITS, zlib.DEF_MEM_LEVEL
+        if zdict:
+            compressor = zlib.compressobj(
+                level, zlib.DEFLATED, wbits, mem_level, zdict=zdict
+            )
+            header = ZDICT_HEADER.pack(ZDICT, class_id, zlib.adler32(zdict))
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, wbits, mem_level)
+            header = bytes((ZLIB,))
+        compressed = compressor.compress(payload) + compressor.flush()
+        if len(header) + len(compressed) < len(payload) + 1:
+            return header + compressed
+    return bytes((RAW,)) + payload
+
+
+def deserialize_compressed(val: bytes) -> Any:
+    """
+    Reverse `serialize_compressed`.
+
+    :param val: Should be a value returned by the `serialize_compressed` function.
+    """
+    return deserialize(decompress(val))
+
+
+def decompress(val: bytes) -> bytes:
+    "Strip the header from a `serialize_compressed` blob and inflate the payload."
+    if not val:
+        raise SerializationError("Empty compressed payload.")
+    codec = val[0]
+    if codec == RAW:
+        return val[1:]
+    if codec == ZLIB:
+        return _inflate(zlib.decompressobj(WBITS), val[1:])
+    if codec == ZDICT:
+        try:
+            _, class_id, dict_id = ZDICT_HEADER.unpack_from(val)
+        except struct.error as ex:
+            raise SerializationError("Truncated compression header.") from ex
+        zdict = ID_TO_ZDICT.get(class_id)
+        if zdict is None:
+            raise SerializationError(
+                f"No compression dictionary loaded for class id {class_id}."
+            )
+        if zlib.adler32(zdict) != dict_id:
+            raise SerializationError(
+                f"Payload of class id {class_id} was compressed with another "
+                "dictionary than the one loaded."
+            )
+        return _inflate(
+            zlib.decompressobj(WBITS, zdict=zdict), val[ZDICT_HEADER.size :]
+        )
+    raise SerializationError(f"Unknown compression header {codec}.")
+
+
+def _inflate(decompressor: Any, data: bytes) -> bytes:
+    try:
+        inflated: bytes = decompressor.decompress(data) + decompressor.flush()
+    except zlib.error as ex:
+        raise SerializationError("Corrupt compressed payload.") from ex
+    # Raw deflate has no checksum, but does mark its end.
+    if not decompressor.eof:
+        raise SerializationError("Truncated compressed payload.")
+    return inflated
+
+
+def train_dictionary(
+    samples: Iterable[bytes],
+    size: int = DICTIONARY_SIZE,
+    segment_length: int = SEGMENT_LENGTH,
+) -> bytes:
+    """
+    Build a preset dictionary from sample payloads.
+
+    Picks the byte segments shared by the most samples until `size` bytes are
+    used.  The most common segments go last, since deflate encodes matches that
+    are closer to the data more cheaply.
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update(
+            {
+                sample[idx : idx + segment_length]
+                for idx in range(len(sample) - segment_length + 1)
+            }
+        )
+
+    chosen: List[bytes] = []
+    used = 0
+    for segment, count in counts.most_common():
+        if count < 2 or used + len(segment) > size:
+            break
+        if any(segment in other for other in chosen):
+            continue
+        chosen.append(segment)
+        used += len(segment)
+    return b"".join(reversed(chosen))
+
+
+def save_dictionaries(dictionaries: Dict[int, bytes], path: str) -> None:
+    "Write trained dictionaries, keyed by class id, to `path`."
+    with open(path, "wb") as f:
+        f.write(ormsgpack.packb(sorted(dictionaries.items())))
+
+
+def load_dictionaries(path: str) -> Dict[int, bytes]:
+    "Read dictionaries written by `save_dictionaries` into the registry."
+    with open(path, "rb") as f:
+        dictionaries = dict(ormsgpack.unpackb(f.read()))
+    ID_TO_ZDICT.update(dictionaries)
+    return dictionaries
+
+
+def get_dictionary_path() -> Optional[str]:
+    "Location of the dictionary file, from the `ORMSGPACK_DICTIONARIES` setting."
+    from django.conf import settings
+
+    return getattr(settings, "ORMSGPACK_DICTIONARIES", None)
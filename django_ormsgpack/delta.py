@@ -0,0 +1,114 @@
+"""
+Deltas between two versions of a serialized model, carrying only the
+positions of `to_tuple` that changed.
+
+A delta is a packed flat list of `position, value` pairs.  A negative position
+`-(idx + 1)` is followed by the delta of the nested list at `idx` rather than
+by its full value, so that a change to one field of an embedded related
+instance doesn't carry the whole instance.
+"""
+
+from typing import Any, List, Sequence, Union
+
+import ormsgpack
+
+from .serializer_fns import MODEL
+
+Values = Union[list, tuple]
+
+
+def _values(val: Any) -> Values:
+    "The `to_tuple` values of an instance, or of a blob from either serializer."
+    if not isinstance(val, bytes):
+        return val.to_tuple()
+    unpacked = ormsgpack.unpackb(val)
+    if _is_tagged(unpacked):
+        return unpacked[2]
+    return unpacked
+
+
+def _is_tagged(unpacked: Any) -> bool:
+    "Whether `unpacked` came from `serializer.serialize` rather than `serialize`."
+    return (
+        isinstance(unpacked, list)
+        and len(unpacked) == 3
+        and unpacked[0] == MODEL
+        and isinstance(unpacked[2], list)
+    )
+
+
+def _same(old: Any, new: Any) -> bool:
+    """
+    Whether `old` and `new` pack the same, unlike `==`, for which `1 == True`
+    and `0 == 0.0`.  Lists and tuples pack the same.
+    """
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        return len(old) == len(new) and all(map(_same, old, new))
+    if isinstance(old, dict) and isinstance(new, dict):
+        return old.keys() == new.keys() and all(
+            _same(value, new[key]) for key, value in old.items()
+        )
+    return type(old) is type(new) and old == new
+
+
+def diff(old: Values, new: Values) -> List[Any]:
+    "The delta turning the values `old` into `new`, unpacked."
+    if len(old) != len(new):
+        raise ValueError(
+            f"Cannot diff {len(old)} values with {len(new)}, the serialized "
+            "fields are not the same."
+        )
+    delta: List[Any] = []
+    for idx, (old_value, new_value) in enumerate(zip(old, new)):
+        if _same(old_value, new_value):
+            continue
+        if (
+            isinstance(old_value, (list, tuple))
+            and isinstance(new_value, (list, tuple))
+            and len(old_value) == len(new_value)
+        ):
+            nested = diff(old_value, new_value)
+            if nested:
+                delta += (-(idx + 1), nested)
+        else:
+            delta += (idx, new_value)
+    return delta
+
+
+def patch(values: Values, delta: Sequence[Any]) -> list:
+    "Apply an unpacked `delta` to `values`, returning new values."
+    result = list(values)
+    for position, value in zip(delta[::2], delta[1::2]):
+        if position < 0:
+            idx = -position - 1
+            result[idx] = patch(result[idx], value)
+        else:
+            result[position] = value
+    return result
+
+
+def serialize_delta(old: Any, new: Any) -> bytes:
+    """
+    Pack the positions of `new.to_tuple()` that differ from `old`.
+
+    :param old: An instance of the same model as `new`, or a blob of one made
+                by `serialize` or `serializer.serialize`.
+    """
+    if not isinstance(old, bytes) and type(old) is not type(new):
+        raise TypeError(f"Cannot diff {type(old).__name__} with {type(new).__name__}.")
+    return ormsgpack.packb(diff(_values(old), new.to_tuple()))
+
+
+def apply_delta(blob: bytes, delta: Union[bytes, Sequence[Any]]) -> bytes:
+    """
+    Apply a delta from `serialize_delta` to a blob made by `serialize` or
+    `serializer.serialize`, returning a blob of the same kind.
+    """
+    if isinstance(delta, bytes):
+        delta = ormsgpack.unpackb(delta)
+    unpacked = ormsgpack.unpackb(blob)
+    if _is_tagged(unpacked):
+        unpacked[2] = patch(unpacked[2], delta)
+    else:
+        unpacked = patch(unpacked, delta)
+    return ormsgpack.packb(unpacked)
@@ -0,0 +1,49 @@
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...model import SerializableModel
+from ...profiling import profile_fields
+from ...relations import select_related
+
+
+class Command(BaseCommand):
+    help = "Rank the fields of a serializable model by encode/decode cost."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", help="Model to profile, as app_label.ModelName.")
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=1000,
+            help="Number of instances to round-trip.",
+        )
+        parser.add_argument(
+            "--output-dir",
+            help="Directory for the generated source, defaults to the system "
+            "temporary directory.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            ModelClass = apps.get_model(options["model"])
+        except (LookupError, ValueError) as ex:
+            raise CommandError(str(ex)) from ex
+        if not issubclass(ModelClass, SerializableModel):
+            raise CommandError(f"{options['model']} is not serializable.")
+
+        costs = profile_fields(
+            ModelClass,
+            select_related(ModelClass._default_manager.all())[: options["sample"]],
+            options["output_dir"],
+        )
+        width = max((len(cost.name) for cost in costs), default=0)
+        self.stdout.write(
+            f"{'field':<{width}}  {'encode ms':>10}  {'decode ms':>10}  {'total ms':>10}"
+        )
+        for cost in costs:
+            self.stdout.write(
+                f"{cost.name:<{width}}  {cost.encode_ns / 1e6:>10.3f}  "
+                f"{cost.decode_ns / 1e6:>10.3f}  {cost.total_ns / 1e6:>10.3f}"
+            )
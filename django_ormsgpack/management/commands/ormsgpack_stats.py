@@ -0,0 +1,56 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ... import metrics
+from ...model import SerializableModel
+from ...registry import CLASS_TO_ID
+from ...relations import select_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Round-trip a sample of each serializable model with metrics enabled "
+        "and dump the per-class encode/decode stats."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=100,
+            help="Number of instances of each model to round-trip.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Dump the stats as JSON."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        recorder = metrics.InMemoryRecorder()
+        metrics.enable(recorder)
+        try:
+            for klass in list(CLASS_TO_ID):
+                if not issubclass(klass, SerializableModel) or klass._meta.abstract:
+                    continue
+                queryset = select_related(klass._default_manager.all())
+                for instance in queryset[: options["sample"]]:
+                    klass.deserialize(instance.serialize())  # type: ignore
+            stats = recorder.snapshot()
+        finally:
+            metrics.disable()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+        for name, class_stats in sorted(
+            stats.items(), key=lambda item: -item[1]["encode_ns"]
+        ):
+            self.stdout.write(
+                f"{name}: "
+                f"encoded {class_stats['encode_count']} in "
+                f"{class_stats['encode_ns'] / 1e6:.3f}ms, "
+                f"decoded {class_stats['decode_count']} in "
+                f"{class_stats['decode_ns'] / 1e6:.3f}ms, "
+                f"sizes {class_stats['sizes'][metrics.ENCODE]}"
+            )
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...compression import (
+    DICTIONARY_SIZE,
+    get_dictionary_path,
+    save_dictionaries,
+    train_dictionary,
+)
+from ...model import SerializableModel
+from ...registry import CLASS_TO_ID
+from ...relations import select_related
+from ...serializer import serialize
+
+
+class Command(BaseCommand):
+    help = "Train preset compression dictionaries for serializable models."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=1000,
+            help="Number of instances of each model to sample.",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=DICTIONARY_SIZE,
+            help="Maximum size in bytes of each dictionary.",
+        )
+        parser.add_argument(
+            "--output",
+            default=get_dictionary_path(),
+            help="File to write, defaults to the ORMSGPACK_DICTIONARIES setting.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not options["output"]:
+            raise CommandError("Provide --output or set ORMSGPACK_DICTIONARIES.")
+
+        dictionaries: Dict[int, bytes] = {}
+        for klass, class_id in CLASS_TO_ID.items():
+            if not issubclass(klass, SerializableModel) or klass._meta.abstract:
+                continue
+            queryset = select_related(klass._default_manager.all())
+            samples: List[bytes] = [
+                serialize(instance) for instance in queryset[: options["samples"]]
+            ]
+            if not samples:
+                continue
+            dictionaries[class_id] = train_dictionary(samples, options["size"])
+            self.stdout.write(
+                f"{klass._meta.label}: {len(samples)} samples, "
+                f"{len(dictionaries[class_id])} byte dictionary"
+            )
+
+        save_dictionaries(dictionaries, options["output"])
+        self.stdout.write(
+            f"Wrote {len(dictionaries)} dictionaries to {options['output']}"
+        )
@@ -0,0 +1,171 @@
+"""
+Opt-in per-class encode/decode metrics.
+
+Codecs are compiled either plain or instrumented depending on whether a recorder
+is installed at the time they are compiled, and `enable`/`disable` discard the
+compiled codecs so that the next call recompiles them.  While metrics are
+disabled the codecs are exactly what they would be without this module, and
+`serialize`/`deserialize` only check for a recorder to report payload sizes to.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Optional, Type
+
+from .registry import LOCK, class_fqname
+from .serializable import Serializable
+
+ENCODE = "encode"
+DECODE = "decode"
+
+
+class MetricsRecorder:
+    """
+    Receives measurements from instrumented codecs.  Subclass it to forward
+    measurements to a metrics backend, and install it with `enable`.
+    """
+
+    def record_encode(self, klass: Type[Serializable], nanoseconds: int) -> None:
+        "Called after each `to_tuple` of an instance of `klass`."
+
+    def record_decode(self, klass: Type[Serializable], nanoseconds: int) -> None:
+        "Called after each `from_tuple` of `klass`."
+
+    def record_size(
+        self, klass: Type[Serializable], direction: str, nbytes: int
+    ) -> None:
+        "Called with the payload size on `serialize` and `deserialize`."
+
+    def record_compile(
+        self, klass: Type[Serializable], function: str, nanoseconds: int
+    ) -> None:
+        "Called when a codec function of `klass` is compiled."
+
+
+def size_bucket(nbytes: int) -> int:
+    "Upper bound of the power-of-two histogram bucket for a payload size."
+    return 1 << max(nbytes - 1, 0).bit_length()
+
+
+@dataclass
+class ClassStats:
+    encode_count: int = 0
+    encode_ns: int = 0
+    decode_count: int = 0
+    decode_ns: int = 0
+    sizes: Dict[str, Counter] = field(
+        default_factory=lambda: {ENCODE: Counter(), DECODE: Counter()}
+    )
+    compile_ns: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "encode_count": self.encode_count,
+            "encode_ns": self.encode_ns,
+            "decode_count": self.decode_count,
+            "decode_ns": self.decode_ns,
+            "sizes": {
+                direction: dict(sorted(histogram.items()))
+                for direction, histogram in self.sizes.items()
+            },
+            "compile_ns": dict(self.compile_ns),
+        }
+
+
+class InMemoryRecorder(MetricsRecorder):
+    "Accumulates measurements per class in process memory."
+
+    def __init__(self) -> None:
+        self.stats: Dict[Type[Serializable], ClassStats] = {}
+
+    def _get(self, klass: Type[Serializable]) -> ClassStats:
+        try:
+            return self.stats[klass]
+        except KeyError:
+            return self.stats.setdefault(klass, ClassStats())
+
+    def record_encode(self, klass: Type[Serializable], nanoseconds: int) -> None:
+        stats = self._get(klass)
+        stats.encode_count += 1
+        stats.encode_ns += nanoseconds
+
+    def record_decode(self, klass: Type[Serializable], nanoseconds: int) -> None:
+        stats = self._get(klass)
+        stats.decode_count += 1
+        stats.decode_ns += nanoseconds
+
+    def record_size(
+        self, klass: Type[Serializable], direction: str, nbytes: int
+    ) -> None:
+        self._get(klass).sizes[direction][size_bucket(nbytes)] += 1
+
+    def record_compile(
+        self, klass: Type[Serializable], function: str, nanoseconds: int
+    ) -> None:
+        self._get(klass).compile_ns[function] = nanoseconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        "Stats of every class seen so far, keyed by full class name."
+        return {
+            class_fqname(klass): stats.as_dict() for klass, stats in self.stats.items()
+        }
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+RECORDER: Optional[MetricsRecorder] = None
+
+
+def enable(recorder: Optional[MetricsRecorder] = None) -> MetricsRecorder:
+    """
+    Install `recorder` (an `InMemoryRecorder` by default) and recompile codecs
+    with instrumentation.
+    """
+    global RECORDER  # pylint: disable=global-statement
+
+    recorder = recorder or InMemoryRecorder()
+    with LOCK:
+        RECORDER = recorder
+        _discard_codecs()
+    return recorder
+
+
+def disable() -> None:
+    "Remove the recorder and go back to plain codecs."
+    global RECORDER  # pylint: disable=global-statement
+
+    with LOCK:
+        RECORDER = None
+        _discard_codecs()
+
+
+def get_recorder() -> Optional[MetricsRecorder]:
+    return RECORDER
+
+
+def _discard_codecs() -> None:
+    """
+    Drop the compiled codecs.  Called holding `LOCK`, which compiling takes, with
+    `RECORDER` already replaced, so that no codec compiled for the previous
+    recorder is stored after them.
+    """
+    from .model import _DESERIALIZERS, _SERIALIZERS
+    from .serializer_fns import _TREE_CODECS
+
+    _SERIALIZERS.clear()
+    _DESERIALIZERS.clear()
+    _TREE_CODECS.clear()
+
+
+def timed_compile(
+    klass: Type[Serializable], function: str, compile_fn: Callable[[], None]
+) -> None:
+    "Run `compile_fn`, reporting how long it took if metrics are enabled."
+    start = perf_counter_ns()
+    compile_fn()
+    if RECORDER is not None:
+        RECORDER.record_compile(klass, function, perf_counter_ns() - start)
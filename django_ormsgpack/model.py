@@ -6,10 +6,12 @@ from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Optional,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -19,8 +21,17 @@ import ormsgpack
 from django.db.models import Model
 from django.db.models.fields import Field, UUIDField
 
+from . import metrics
+from .registry import LOCK
 from .serializable import Serializable
-from .serializer_fns import compile_from_tuple_function, compile_to_tuple_function
+from .serializer_fns import (
+    compile_from_dict_function,
+    compile_from_tuple_function,
+    compile_projected_from_tuple_function,
+    compile_to_dict_function,
+    compile_to_tuple_function,
+    is_parent_link,
+)
 
 T = TypeVar("T", bound=Serializable)
 
@@ -28,8 +39,23 @@ SerializerFunction = Callable[[Serializable], tuple]
 DeserializerFunction = Callable[[Union[list, tuple]], Serializable]
 
 
+def _compile(codecs: dict, key: Any, compile_fn: Callable, *args: Any) -> None:
+    """
+    `compile_fn(*args, codecs)`, unless another thread already compiled `key`.
+    Reads of `codecs` take no lock.
+    """
+    with LOCK:
+        if key not in codecs:
+            compile_fn(*args, codecs)
+
+
 _SERIALIZERS: Dict[Type[Serializable], SerializerFunction] = {}
 _DESERIALIZERS: Dict[Type[Serializable], DeserializerFunction] = {}
+_PROJECTED_DESERIALIZERS: Dict[
+    Tuple[Type[Serializable], FrozenSet[str]], DeserializerFunction
+] = {}
+_DICT_SERIALIZERS: Dict[Type[Serializable], Callable[[Serializable], dict]] = {}
+_DICT_DESERIALIZERS: Dict[Type[Serializable], Callable[[dict], Serializable]] = {}
 
 
 class SerializationError(Exception):
@@ -56,7 +82,7 @@ class SerializableModel(Model):
     # def dumps(self, load_related: Optional[bool] = None) -> str:
     #     return packb(self.to_tuple(load_related))
     _serializer_fields: Optional[List[Field]] = None
-    _serializer_names: Optional[Set[str]] = None
+    _serialized_field_names: Optional[Set[str]] = None
     _serializer_id: Optional[int] = None
 
     _is_deserialized_copy: bool = False
@@ -83,7 +109,8 @@ class SerializableModel(Model):
             or force_insert
             or force_update
             or self.pk is None
-            or len(type(self).serialized_field_names()) == len(self._meta.fields)
+            or len(type(self).serialized_field_names())
+            == sum(not is_parent_link(field) for field in self._meta.fields)
         ):
             return super().save(
                 force_insert, force_update, update_fields=update_fields, **kwargs
@@ -101,8 +128,10 @@ class SerializableModel(Model):
     @classmethod
     def serialized_field_names(cls) -> Set[str]:
         "Set of names of fields to be serialized"
-        if cls._serialized_field_names is not None:
-            return cls._serialized_field_names
+        # Looked up in the class __dict__ so that subclasses don't inherit
+        # their parent's cached value.
+        if cls.__dict__.get("_serialized_field_names") is not None:
+            return cls._serialized_field_names  # type: ignore
         cls._serialized_field_names = {
             field.name for field in cls.get_serializer_fields()
         }
@@ -110,8 +139,8 @@ class SerializableModel(Model):
 
     @classmethod
     def get_serializer_fields(cls) -> List[Field]:
-        if cls._serializer_fields is not None:
-            return cls._serializer_fields
+        if cls.__dict__.get("_serializer_fields") is not None:
+            return cls._serializer_fields  # type: ignore
 
         try:
             metadata = cls.Serialize
@@ -120,17 +149,27 @@ class SerializableModel(Model):
                 "No Serialize class defined on the model."
             ) from None
 
-        fields = cls._meta.fields  # pylint: disable=E1101
+        # Parent links hold the primary key again, and are set from it.
+        fields = [
+            field
+            for field in cls._meta.fields  # pylint: disable=E1101
+            if not is_parent_link(field)
+        ]
         if hasattr(metadata, "fields"):
             fields = [
                 field
                 for field in fields
-                if field.name in metadata.fields
-                or field is cls._meta.pk  # pylint: disable=E1101
+                if field.name in metadata.fields or field.primary_key
             ]
         cls._serializer_fields = fields
         return fields
 
+    @classmethod
+    def compile_codecs(cls) -> None:
+        "Compile `to_tuple` and `from_tuple` now rather than on first use."
+        _compile(_SERIALIZERS, cls, compile_to_tuple_function, cls)
+        _compile(_DESERIALIZERS, cls, compile_from_tuple_function, cls)
+
     @classmethod
     def from_tuple(cls: T, values: Iterable[Any]) -> T:  # type: ignore
         """
@@ -139,15 +178,59 @@ class SerializableModel(Model):
         try:
             return _DESERIALIZERS[cls](values)  # type: ignore
         except KeyError:
+            if cls in _DESERIALIZERS:  # A bad value in `values`.
+                raise
             try:
-                compile_from_tuple_function(cls, _DESERIALIZERS)  # type: ignore
-                return cls.from_tuple(values)  # type: ignore
+                _compile(_DESERIALIZERS, cls, compile_from_tuple_function, cls)
             except Exception as ex:
                 traceback.print_exc()
                 raise SerializationError() from ex
+            return cls.from_tuple(values)  # type: ignore
 
     @classmethod
-    def deserialize(cls: T, val: bytes) -> T:  # type: ignore
+    def from_tuple_only(cls: T, values: Iterable[Any], only: Iterable[str]) -> T:  # type: ignore
+        """
+        Build object from values created by `to_tuple`, decoding only the fields
+        named in `only` and the primary key.  As with `QuerySet.only`, the other
+        fields are deferred and loaded from the database on access.  Related
+        instances are not built, only their primary keys are kept.
+        """
+        key = (cls, frozenset(only))
+        try:
+            return _PROJECTED_DESERIALIZERS[key](values)  # type: ignore
+        except KeyError:
+            if key in _PROJECTED_DESERIALIZERS:
+                raise
+            unknown = key[1] - cls.serialized_field_names()  # type: ignore
+            if unknown:
+                raise SerializationProgrammingError(
+                    f"Fields not serialized by {cls.__name__}: "  # type: ignore
+                    + ", ".join(sorted(unknown))
+                ) from None
+            try:
+                _compile(
+                    _PROJECTED_DESERIALIZERS,
+                    key,
+                    compile_projected_from_tuple_function,
+                    cls,
+                    key[1],
+                )
+            except Exception as ex:
+                traceback.print_exc()
+                raise SerializationError() from ex
+            return cls.from_tuple_only(values, key[1])  # type: ignore
+
+    @classmethod
+    def deserialize(  # type: ignore
+        cls: T, val: bytes, only: Optional[Iterable[str]] = None
+    ) -> T:
+        """
+        :param only: Decode only these fields, see `from_tuple_only`.
+        """
+        if metrics.RECORDER is not None:
+            metrics.RECORDER.record_size(cls, metrics.DECODE, len(val))  # type: ignore
+        if only is not None:
+            return cls.from_tuple_only(ormsgpack.unpackb(val), only)  # type: ignore
         return cls.from_tuple(
             ormsgpack.unpackb(val)
         )  # pylint: disable=c-extension-no-member
@@ -159,15 +242,64 @@ class SerializableModel(Model):
         try:
             return _SERIALIZERS[self.__class__](self)
         except KeyError:
+            if self.__class__ in _SERIALIZERS:
+                raise
             try:
-                compile_to_tuple_function(self.__class__, _SERIALIZERS)
-                return self.to_tuple()
+                _compile(
+                    _SERIALIZERS,
+                    self.__class__,
+                    compile_to_tuple_function,
+                    self.__class__,
+                )
             except Exception as ex:
                 traceback.print_exc()
                 raise SerializationError() from ex
+            return self.to_tuple()
 
     def serialize(self) -> bytes:
-        return ormsgpack.packb(self.to_tuple())
+        val: bytes = ormsgpack.packb(self.to_tuple())
+        if metrics.RECORDER is not None:
+            metrics.RECORDER.record_size(type(self), metrics.ENCODE, len(val))
+        return val
+
+    @classmethod
+    def from_dict(cls: T, values: Dict[str, Any]) -> T:  # type: ignore
+        """
+        Build object from values created by `to_dict`.
+        """
+        try:
+            return _DICT_DESERIALIZERS[cls](values)  # type: ignore
+        except KeyError:
+            if cls in _DICT_DESERIALIZERS:  # A key missing from `values`.
+                raise
+            try:
+                _compile(_DICT_DESERIALIZERS, cls, compile_from_dict_function, cls)
+            except Exception as ex:
+                traceback.print_exc()
+                raise SerializationError() from ex
+            return cls.from_dict(values)  # type: ignore
+
+    def to_dict(self) -> dict:
+        """
+        Convert the object to a dict of the same values as `to_tuple`, keyed by
+        field name.
+        """
+        try:
+            return _DICT_SERIALIZERS[self.__class__](self)
+        except KeyError:
+            if self.__class__ in _DICT_SERIALIZERS:
+                raise
+            try:
+                _compile(
+                    _DICT_SERIALIZERS,
+                    self.__class__,
+                    compile_to_dict_function,
+                    self.__class__,
+                )
+            except Exception as ex:
+                traceback.print_exc()
+                raise SerializationError() from ex
+            return self.to_dict()
 
     class Meta:
         abstract = True
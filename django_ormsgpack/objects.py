@@ -0,0 +1,57 @@
+"""
+Codecs of classes registered with `registry.serializable`: dataclasses,
+NamedTuples, attrs classes and Enums.  The methods here are attached to each
+registered class, and compile its codecs on first use, like those of
+`SerializableModel`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable
+
+from .registry import LOCK
+from .serializer_fns import (
+    compile_object_from_tuple_function,
+    compile_object_to_tuple_function,
+)
+
+_SERIALIZERS: Dict[type, Callable[[Any], tuple]] = {}
+_DESERIALIZERS: Dict[type, Callable[[Any, bool], Any]] = {}
+
+
+def compile_codecs(cls: Any) -> None:
+    "Compile `to_tuple` and `from_tuple` now rather than on first use."
+    with LOCK:
+        if cls not in _SERIALIZERS:
+            compile_object_to_tuple_function(cls, _SERIALIZERS)
+        if cls not in _DESERIALIZERS:
+            compile_object_from_tuple_function(cls, _DESERIALIZERS)
+
+
+def to_tuple(self: Any) -> tuple:
+    """
+    Convert the object to a tuple of its field values.
+    """
+    try:
+        return _SERIALIZERS[self.__class__](self)
+    except KeyError:
+        if self.__class__ in _SERIALIZERS:
+            raise
+        compile_codecs(self.__class__)
+        return self.to_tuple()
+
+
+def from_tuple(cls: Any, values: Iterable[Any], registered_only: bool = False) -> Any:
+    """
+    Build object from values created by `to_tuple`.
+
+    :param registered_only: As for `serializer.deserialize`, for the classes
+                            named in field values.
+    """
+    try:
+        return _DESERIALIZERS[cls](values, registered_only)
+    except KeyError:
+        if cls in _DESERIALIZERS:
+            raise
+        compile_codecs(cls)
+        return cls.from_tuple(values, registered_only)
@@ -0,0 +1,268 @@
+"""
+Bulk serialization across an executor.
+
+The generated codecs are pure Python, so a single process tops out at one core.
+These helpers split their input into chunks and run the codecs on the workers
+of a `concurrent.futures` executor, typically a `ProcessPoolExecutor` created
+with `initialize_worker` as its initializer so that each worker sets up Django
+and compiles the codecs once.
+
+Values sent to or returned from worker processes are pickled on the way, which
+for models costs about as much as serializing them, and is done by the parent
+process alone.  So `serialize_many` refuses to send model instances to a process
+pool: export a QuerySet with `serialize_queryset`, which only sends primary keys
+and lets the workers fetch the rows themselves.  `deserialize_many` sends blobs,
+but pickles the decoded values back; `python -m benchmarks.parallel` measures
+both.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from django.db.models import Model, QuerySet
+
+from .registry import CLASS_TO_ID
+from .serializer import deserialize, serialize
+
+CHUNK_SIZE = 1000
+# Chunks in flight for each worker of the executor, so that workers never wait
+# for the next chunk while the input and results are never held all at once.
+CHUNKS_PER_WORKER = 2
+
+V = TypeVar("V")
+R = TypeVar("R")
+
+# Database connections inherited from the parent process, kept so that they are
+# never closed, which would close the parent's socket too.
+_INHERITED_CONNECTIONS: List[Any] = []
+
+
+def initialize_worker(settings_module: Optional[str] = None) -> None:
+    """
+    Executor initializer: set up Django, or, in a worker forked from a process
+    that already did, drop the database connections it inherited, and compile
+    the codecs of every registered model.
+    """
+    from django.apps import apps
+
+    if apps.ready:
+        _detach_connections()
+    else:
+        import django
+
+        if settings_module:
+            os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+        django.setup()
+    warm_codecs()
+
+
+def _detach_connections() -> None:
+    "Make each database connection open its own socket on next use."
+    from django.db import connections
+
+    for conn in connections.all():
+        if conn.connection is not None:
+            _INHERITED_CONNECTIONS.append(conn.connection)
+            conn.connection = None
+
+
+def warm_codecs() -> None:
+    "Compile the codecs of every registered model class."
+    from .model import SerializableModel
+
+    for klass in list(CLASS_TO_ID):
+        if issubclass(klass, SerializableModel) and not klass._meta.abstract:
+            klass.compile_codecs()
+
+
+def chunked(values: Iterable[V], chunk_size: int) -> Iterator[List[V]]:
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _serialize_chunk(chunk: List[Any]) -> List[bytes]:
+    return [serialize(val) for val in chunk]
+
+
+def _deserialize_chunk(chunk: List[bytes]) -> List[Any]:
+    return [deserialize(val) for val in chunk]
+
+
+def _rows(model_label: str, query: Any, pks: List[Any]) -> QuerySet:
+    "The rows of `query` with primary keys in `pks`."
+    from django.apps import apps
+
+    ModelClass = apps.get_model(model_label)
+    queryset = ModelClass._default_manager.all()
+    queryset.query = query
+    return queryset.filter(pk__in=pks)
+
+
+def _serialize_rows(model_label: str, query: Any, pks: List[Any]) -> List[bytes]:
+    by_pk = {instance.pk: instance for instance in _rows(model_label, query, pks)}
+    return [serialize(by_pk[pk]) for pk in pks if pk in by_pk]
+
+
+def _row_query(queryset: QuerySet) -> Any:
+    """
+    The query that workers fetch rows of `queryset` with, by primary key.  Its
+    slice, if any, was applied to the primary keys already.
+    """
+    if queryset.query.combinator:
+        raise ValueError(
+            f"Cannot serialize a {queryset.query.combinator}() of querysets in "
+            "parallel, serialize each of them instead."
+        )
+    query = queryset.query.chain()
+    query.clear_limits()
+    return query
+
+
+def _primary_keys(queryset: QuerySet, chunk_size: int) -> Iterator[Any]:
+    return queryset.values_list("pk", flat=True).iterator(chunk_size=chunk_size)
+
+
+def _without_instances(chunks: Iterable[List[Any]]) -> Iterator[List[Any]]:
+    for chunk in chunks:
+        if any(isinstance(val, Model) for val in chunk):
+            raise ValueError(
+                "Model instances are pickled to reach worker processes, which "
+                "costs as much as serializing them; use serialize_queryset, or "
+                "a thread pool."
+            )
+        yield chunk
+
+
+def _map_chunks(
+    fn: Callable[..., List[R]],
+    chunks: Iterable[Any],
+    executor: Optional[Executor],
+    ordered: bool,
+    workers: Optional[int],
+) -> Iterator[R]:
+    if executor is None:
+        for chunk in chunks:
+            yield from fn(*chunk)
+        return
+    chunks = iter(chunks)
+    window = CHUNKS_PER_WORKER * (workers or os.cpu_count() or 1)
+
+    def submit_next() -> Iterator[Future]:
+        for chunk in islice(chunks, 1):
+            yield executor.submit(fn, *chunk)
+
+    if ordered:
+        queue: Deque[Future] = deque()
+        for _ in range(window):
+            queue.extend(submit_next())
+        while queue:
+            future = queue.popleft()
+            queue.extend(submit_next())
+            yield from future.result()
+        return
+    pending: Set[Future] = set()
+    for _ in range(window):
+        pending.update(submit_next())
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.update(submit_next())
+            yield from future.result()
+
+
+def serialize_many(
+    values: Iterable[Any],
+    executor: Optional[Executor] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+    workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Serialize each of `values`, in chunks of `chunk_size` run on `executor`.
+
+    Results are yielded in the order of `values`, or, if `ordered` is False, a
+    chunk at a time as soon as each chunk is done.  `workers` is the number of
+    workers of `executor`, by default the number of CPUs, and bounds the chunks
+    in flight.  Without an executor the values are serialized in this process.
+    Model instances cannot be sent to a `ProcessPoolExecutor`, as pickling them
+    costs the parent process more than serializing them.
+    """
+    chunks: Iterable[List[Any]] = chunked(values, chunk_size)
+    if isinstance(executor, ProcessPoolExecutor):
+        chunks = _without_instances(chunks)
+    return _map_chunks(
+        _serialize_chunk,
+        ((chunk,) for chunk in chunks),
+        executor,
+        ordered,
+        workers,
+    )
+
+
+def deserialize_many(
+    values: Iterable[bytes],
+    executor: Optional[Executor] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+    workers: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    The reverse of `serialize_many`.  Worker processes pickle the decoded values
+    back to this process.
+    """
+    return _map_chunks(
+        _deserialize_chunk,
+        ((chunk,) for chunk in chunked(values, chunk_size)),
+        executor,
+        ordered,
+        workers,
+    )
+
+
+def serialize_queryset(
+    queryset: QuerySet,
+    executor: Optional[Executor] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+    workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Serialize every row of `queryset`, which may be sliced.  Only the primary
+    keys are read here; the workers fetch and serialize the rows, with the same
+    filters and `select_related` as `queryset`, a chunk at a time.
+    """
+    model_label = queryset.model._meta.label
+    query = _row_query(queryset)
+    pks = _primary_keys(queryset, chunk_size)
+    return _map_chunks(
+        _serialize_rows,
+        ((model_label, query, chunk) for chunk in chunked(pks, chunk_size)),
+        executor,
+        ordered,
+        workers,
+    )
@@ -0,0 +1,77 @@
+"""
+Per-field profiling of the generated codecs.
+
+Compiles profiling builds of a model's `to_tuple`/`from_tuple`, which time each
+field separately and are written to files so that tracebacks and profilers can
+show their source, then ranks the fields by cost over a sample of instances.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from dataclasses import dataclass
+from os import path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+import ormsgpack
+
+from .model import SerializableModel
+from .serializer_fns import compile_from_tuple_function, compile_to_tuple_function
+
+
+@dataclass
+class FieldCost:
+    name: str
+    encode_ns: int
+    decode_ns: int
+
+    @property
+    def total_ns(self) -> int:
+        return self.encode_ns + self.decode_ns
+
+
+def profile_fields(
+    ModelClass: Type[SerializableModel],
+    instances: Iterable[SerializableModel],
+    directory: Optional[str] = None,
+) -> List[FieldCost]:
+    """
+    Round-trip `instances` through profiling builds of the codecs of
+    `ModelClass`, and return the cost of each field, most expensive first.
+
+    :param directory: Where to write the generated source, defaults to the
+                      system temporary directory.
+    """
+    fields = ModelClass.get_serializer_fields()
+    directory = directory or tempfile.gettempdir()
+    encode_ns = [0] * len(fields)
+    decode_ns = [0] * len(fields)
+    serializers: Dict[type, Callable[..., Any]] = {}
+    deserializers: Dict[type, Callable[..., Any]] = {}
+    compile_to_tuple_function(
+        ModelClass,
+        serializers,
+        profile=encode_ns,
+        filename=path.join(directory, f"{ModelClass.__name__}_to_tuple.py"),
+    )
+    compile_from_tuple_function(
+        ModelClass,
+        deserializers,
+        profile=decode_ns,
+        filename=path.join(directory, f"{ModelClass.__name__}_from_tuple.py"),
+    )
+    to_tuple = serializers[ModelClass]
+    from_tuple = deserializers[ModelClass]
+
+    for instance in instances:
+        # Decode what msgpack gives back, lists and all.
+        from_tuple(ormsgpack.unpackb(ormsgpack.packb(to_tuple(instance))))
+
+    return sorted(
+        (
+            FieldCost(field.name, encoded, decoded)
+            for field, encoded, decoded in zip(fields, encode_ns, decode_ns)
+        ),
+        key=lambda cost: cost.total_ns,
+        reverse=True,
+    )
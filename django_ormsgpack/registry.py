@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from threading import RLock
 from typing import Dict, Type, TypeVar, Union
 from zlib import adler32
 
@@ -10,10 +11,19 @@ from .serializable import Serializable
 
 CLASS_TO_ID: Dict[Type[Serializable], int] = {}
 ID_TO_CLASS: Dict[Union[int, str], Type[Serializable]] = {}
+# Preset compression dictionaries by class id, see `compression`.
+ID_TO_ZDICT: Dict[int, bytes] = {}
 ASCII = "ascii"
 
 SERIALIZER_ID = "_serializer_id"
 
+# Held while writing to the registry or compiling codecs, which only happens
+# once per class, so that threads never compile the same codecs twice.  Reads
+# take no lock.
+LOCK = RLock()
+# Set by `freeze`, after which decoding never writes to the registry.
+_FROZEN = False
+
 
 def class_fqname(klass: Type[Serializable]) -> str:
     "Return the dot-separated module and class name."
@@ -33,7 +43,20 @@ def get_class(class_fqn: Union[str, int]) -> Type[Serializable]:
         klass = import_string(class_fqn)
         if klass is None:
             raise ValueError(f"I don't recognize {class_fqn}.")
-        ID_TO_CLASS[class_fqn] = klass
+        if not _FROZEN:
+            with LOCK:
+                ID_TO_CLASS.setdefault(class_fqn, klass)
+    return klass
+
+
+def get_registered_class(class_id: Union[str, int]) -> Type[Serializable]:
+    """
+    Like `get_class`, but only for classes registered with `serializable_model`,
+    and without importing anything.  Use it to decode untrusted payloads.
+    """
+    klass = ID_TO_CLASS.get(class_id)
+    if klass is None or klass not in CLASS_TO_ID:
+        raise ValueError(f"{class_id!r} is not a registered serializable class.")
     return klass
 
 
@@ -78,8 +101,57 @@ def serializable_model(decorated: R) -> Union[R, Serializable]:
         decorated = ModelClass  # type: ignore
         Serializable.register(decorated)
 
+    _register(decorated)
+    return decorated
+
+
+def _register(decorated: type) -> None:
     id_num = adler32(class_fqname(decorated).encode(ASCII))
-    ID_TO_CLASS[id_num] = decorated
-    CLASS_TO_ID[decorated] = id_num
-    decorated._serializer_id = id_num
+    with LOCK:
+        ID_TO_CLASS[id_num] = decorated
+        CLASS_TO_ID[decorated] = id_num
+    decorated._serializer_id = id_num  # type: ignore
+
+
+def freeze() -> None:
+    """
+    Compile the codecs of every registered class, and load the timezone tables,
+    so that worker threads only ever read them.  Classes named in payloads are
+    still imported, but no longer cached.  Call it once all models are loaded,
+    which `ORMSGPACK_FREEZE_REGISTRY = True` does in `AppConfig.ready`, before
+    a preforking server forks.  Classes registered later still work, and
+    compile on first use.
+    """
+    global _FROZEN  # pylint: disable=global-statement
+    from .serializer_fns import load_zones
+
+    load_zones()
+    with LOCK:
+        for klass in list(CLASS_TO_ID):
+            meta = getattr(klass, "_meta", None)
+            if not (meta and meta.abstract):
+                klass.compile_codecs()  # type: ignore
+        _FROZEN = True
+
+
+def is_frozen() -> bool:
+    return _FROZEN
+
+
+C = TypeVar("C", bound=type)
+
+
+def serializable(decorated: C) -> C:
+    """
+    Register a dataclass, NamedTuple, attrs class or Enum, giving it compiled
+    `to_tuple`/`from_tuple` codecs and a compact class id, so that its
+    instances can be serialized on their own or nested in other payloads.
+    """
+    from . import objects
+
+    decorated.to_tuple = objects.to_tuple  # type: ignore
+    decorated.from_tuple = classmethod(objects.from_tuple)  # type: ignore
+    decorated.compile_codecs = classmethod(objects.compile_codecs)  # type: ignore
+    Serializable.register(decorated)
+    _register(decorated)
     return decorated
@@ -0,0 +1,127 @@
+"""
+Relation trees: which related instances the codecs of a model embed.
+
+They are configured on the `Serialize` class of the model:
+
+    class Serialize:
+        related = ("screening", "purchaser__user")  # Or "__all__".
+        related_depth = 2  # How deep "__all__" goes, 1 by default.
+        pk_only = ("purchaser__user",)  # Never embedded.
+
+`load_related = True` is the same as `related = "__all__"`.  Embedded
+instances follow the tree rather than their own `Serialize` class, and are
+encoded whether or not they were loaded already.  Without any of these, a
+related instance is embedded only if it is in the `_state.fields_cache` of the
+instance, and `pk_only` names relations that never are.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Collection, Dict, List, Optional, Tuple, Type
+
+from django.db.models import Model, QuerySet
+from django.db.models.fields import Field
+
+Tree = Dict[str, "Tree"]
+
+ALL = "__all__"
+DEFAULT_DEPTH = 1
+
+
+def embeddable(field: Field) -> bool:
+    "Whether `field` is a forward relation to a serializable model."
+    return (
+        field.is_relation
+        and (field.many_to_one or field.one_to_one)
+        and field.concrete
+        and hasattr(field.related_model, "get_serializer_fields")
+    )
+
+
+def relation_tree(ModelClass: Type[Model]) -> Optional[Tree]:
+    """
+    The tree of relations configured on `ModelClass.Serialize`, or `None` if
+    there is none, so that loaded instances are embedded as they are.
+    """
+    metadata = getattr(ModelClass, "Serialize", None)
+    related = getattr(metadata, "related", None)
+    if related is None and getattr(metadata, "load_related", False):
+        related = ALL
+    if related is None:
+        return None
+    excluded = set(getattr(metadata, "pk_only", ()))
+    if related == ALL:
+        depth = getattr(metadata, "related_depth", DEFAULT_DEPTH)
+        return _all_relations(ModelClass, depth, excluded, "")
+    tree: Tree = {}
+    for path in related:
+        node, klass = tree, ModelClass
+        for name in path.split("__"):
+            field = _serialized_field(klass, name)
+            node = node.setdefault(name, {})
+            klass = field.related_model
+    return _exclude(tree, excluded, "")
+
+
+def _serialized_field(ModelClass: Type[Model], name: str) -> Field:
+    for field in ModelClass.get_serializer_fields():
+        if field.name == name:
+            if not embeddable(field):
+                raise ValueError(
+                    f"{ModelClass.__name__}.{name} is not a relation to a "
+                    "serializable model."
+                )
+            return field
+    raise ValueError(f"{ModelClass.__name__} does not serialize {name}.")
+
+
+def _all_relations(
+    ModelClass: Type[Model], depth: int, excluded: Collection[str], prefix: str
+) -> Tree:
+    if depth <= 0:
+        return {}
+    return {
+        field.name: _all_relations(
+            field.related_model, depth - 1, excluded, f"{prefix}{field.name}__"
+        )
+        for field in ModelClass.get_serializer_fields()
+        # Parent links hold the same values as the child.
+        if embeddable(field)
+        and not field.remote_field.parent_link
+        and prefix + field.name not in excluded
+    }
+
+
+def _exclude(tree: Tree, excluded: Collection[str], prefix: str) -> Tree:
+    return {
+        name: _exclude(subtree, excluded, f"{prefix}{name}__")
+        for name, subtree in tree.items()
+        if prefix + name not in excluded
+    }
+
+
+def freeze(tree: Tree) -> Tuple[Any, ...]:
+    "A hashable equivalent of `tree`."
+    return tuple(sorted((name, freeze(subtree)) for name, subtree in tree.items()))
+
+
+def related_paths(tree: Tree) -> List[str]:
+    "The `select_related` arguments fetching everything in `tree`."
+    paths: List[str] = []
+    for name, subtree in tree.items():
+        if subtree:
+            paths += (f"{name}__{path}" for path in related_paths(subtree))
+        else:
+            paths.append(name)
+    return paths
+
+
+def select_related(queryset: QuerySet) -> QuerySet:
+    """
+    `queryset.select_related(...)` with the relations that the codecs of its
+    model embed, so that they are fetched in the same query.
+    """
+    tree = relation_tree(queryset.model)
+    if not tree:
+        return queryset
+    return queryset.select_related(*related_paths(tree))
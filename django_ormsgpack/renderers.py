@@ -0,0 +1,164 @@
+"""
+`application/msgpack` rendering and parsing of serializable models.
+
+Models are rendered with `to_dict`, so payloads are self-describing, while
+other values are left to ormsgpack, which writes datetimes and UUIDs as
+strings.  `MsgpackRenderer` and `MsgpackParser` plug into Django REST framework;
+`MsgpackStreamingResponse` streams QuerySets from plain Django views.
+"""
+
+from __future__ import annotations
+
+import itertools
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+import ormsgpack
+from django.db import connections
+from django.db.models import Count, QuerySet, Window
+from django.db.models.query import ModelIterable
+from django.http import StreamingHttpResponse
+
+from .model import SerializableModel
+from .serializer import array_header
+
+try:
+    from rest_framework.exceptions import ParseError
+    from rest_framework.parsers import BaseParser
+    from rest_framework.renderers import BaseRenderer
+except ImportError:  # Django REST framework is optional.
+    BaseParser = BaseRenderer = object
+    ParseError = ValueError
+
+MEDIA_TYPE = "application/msgpack"
+CHUNK_SIZE = 500
+# Annotation counting the rows of a streamed QuerySet, in the same query.
+TOTAL = "_ormsgpack_total"
+
+
+def _default(val: Any) -> Any:
+    if isinstance(val, SerializableModel):
+        return val.to_dict()
+    if isinstance(val, QuerySet):
+        return list(val)
+    if isinstance(val, Decimal):
+        return str(val)
+    raise TypeError(f"Can't render {type(val)}.")
+
+
+def render(val: Any) -> bytes:
+    "Pack `val`, rendering serializable models as dicts."
+    return ormsgpack.packb(val, default=_default)
+
+
+def stream_render(values: Iterable[Any], length: int) -> Iterator[bytes]:
+    """
+    Render `values` as a msgpack array of `length` items, an item at a time.
+    Raises `ValueError` if there turn out to be more or fewer, which cuts the
+    output short rather than passing wrong values off as right.
+    """
+    yield array_header(length)
+    rendered = 0
+    for val in values:
+        if rendered == length:
+            raise ValueError(f"More than {length} values to render.")
+        yield render(val)
+        rendered += 1
+    if rendered != length:
+        raise ValueError(f"Rendered {rendered} values out of {length}.")
+
+
+def _countable(queryset: QuerySet) -> bool:
+    "Whether a window over the rows of `queryset` counts exactly those rows."
+    return (
+        connections[queryset.db].features.supports_over_clause
+        and queryset._iterable_class
+        is ModelIterable  # pylint: disable=protected-access
+        and not queryset.query.combinator
+        and not queryset.query.distinct
+    )
+
+
+def stream_counted(
+    rows: Iterator[Any], low: int, high: Optional[int]
+) -> Iterator[bytes]:
+    """
+    Render `rows`, annotated with the `TOTAL` of the query before its slice
+    `[low:high]`, as a msgpack array.
+    """
+    first = next(rows, None)
+    if first is None:
+        yield array_header(0)
+        return
+    total = getattr(first, TOTAL)
+    if high is not None:
+        total = min(total, high)
+    yield from stream_render(itertools.chain((first,), rows), max(total - low, 0))
+
+
+def stream_queryset(
+    queryset: QuerySet, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Render the rows of `queryset`, fetching `chunk_size` rows at a time.  The
+    length of the array is counted by the same query as the rows, so rows
+    written meanwhile can't make it wrong.  Distinct, combined or `values()`
+    QuerySets, and those of databases without window functions, are read in
+    full first instead.
+    """
+    if queryset._result_cache is not None or not _countable(queryset):
+        rows = list(queryset)
+        return stream_render(rows, len(rows))
+    counted = queryset.annotate(**{TOTAL: Window(Count("pk"))})
+    return stream_counted(
+        counted.iterator(chunk_size), queryset.query.low_mark, queryset.query.high_mark
+    )
+
+
+class MsgpackStreamingResponse(StreamingHttpResponse):
+    "Streams a QuerySet, or any sized iterable, as a msgpack array."
+
+    def __init__(
+        self, values: Iterable[Any], chunk_size: int = CHUNK_SIZE, **kwargs: Any
+    ) -> None:
+        kwargs.setdefault("content_type", MEDIA_TYPE)
+        if isinstance(values, QuerySet):
+            content = stream_queryset(values, chunk_size)
+        else:
+            values = list(values)
+            content = stream_render(values, len(values))
+        super().__init__(content, **kwargs)
+
+
+class MsgpackRenderer(BaseRenderer):
+    media_type = MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        if isinstance(data, QuerySet):
+            return b"".join(stream_queryset(data))
+        return render(data)
+
+
+class MsgpackParser(BaseParser):
+    media_type = MEDIA_TYPE
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        try:
+            return ormsgpack.unpackb(stream.read())
+        except ormsgpack.MsgpackDecodeError as ex:
+            raise ParseError(f"msgpack parse error - {ex}") from ex
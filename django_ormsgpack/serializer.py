@@ -1,13 +1,15 @@
+from dataclasses import fields, is_dataclass
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Any
 from uuid import UUID
 
 import ormsgpack
-import pytz
 
-from .model import SerializableModel
+from . import metrics
 from .registry import SERIALIZER_ID, class_fqname
+from .serializable import Serializable
 from .serializer_fns import (
     MODEL,
     TZ,
@@ -18,10 +20,6 @@ from .serializer_fns import (
 )
 
 
-def _tz_id(tz: str) -> int:
-    return pytz.all_timezones.index(tz)
-
-
 # pylint: disable=protected-access
 def ormsgpack_serialize_defaults(val: Any) -> Any:
     if isinstance(val, datetime):
@@ -34,7 +32,7 @@ def ormsgpack_serialize_defaults(val: Any) -> Any:
     if isinstance(val, Decimal):
         return str(val)
 
-    if isinstance(val, SerializableModel):
+    if isinstance(val, Serializable):
         klass = val.__class__
         classid = (
             class_fqname(klass)
@@ -43,17 +41,33 @@ def ormsgpack_serialize_defaults(val: Any) -> Any:
         )
         return (MODEL, classid, val.to_tuple())
 
+    # Unregistered values that ormsgpack was told to pass through: encode them
+    # the way it would have.
+    if isinstance(val, Enum):
+        return val.value
+    if is_dataclass(val):
+        return {field.name: getattr(val, field.name) for field in fields(val)}
+    if isinstance(val, tuple):
+        return list(val)
+
 
-def deserialize(val: bytes) -> Any:
+def deserialize(val: bytes, registered_only: bool = False) -> Any:
     """
     Unpack and unwrap the given value.
 
     :param val: Should be a value returned by the `serialize` function.
+    :param registered_only: Refuse to build instances of any class that was not
+                            registered with `serializable_model`, rather than
+                            importing classes by name.  Use it for payloads that
+                            may not have been produced by this application.
     """
-    return _unwrap(ormsgpack.unpackb(val))
+    result = _unwrap(ormsgpack.unpackb(val), registered_only)
+    if metrics.RECORDER is not None and isinstance(result, Serializable):
+        metrics.RECORDER.record_size(type(result), metrics.DECODE, len(val))
+    return result
 
 
-def _unwrap(unpacked: Any) -> Any:
+def _unwrap(unpacked: Any, registered_only: bool = False) -> Any:
     if isinstance(
         unpacked,
         (
@@ -61,21 +75,54 @@ def _unwrap(unpacked: Any) -> Any:
             tuple,
         ),
     ):
+        if not unpacked:
+            return []
         if unpacked[0] == UUID_IDENTIFIER:
             return UUID(bytes=unpacked[1])
         if unpacked[0] == TZ:
             return deserialize_dt(unpacked[1], unpacked[2])
         if unpacked[0] == MODEL:
-            return deserialize_model(unpacked[1], unpacked[2])
-        return [_unwrap(subval) for subval in unpacked]
+            return deserialize_model(unpacked[1], unpacked[2], registered_only)
+        return [_unwrap(subval, registered_only) for subval in unpacked]
     if isinstance(unpacked, dict):
-        return {key: _unwrap(val) for key, val in unpacked.items()}
+        return {key: _unwrap(val, registered_only) for key, val in unpacked.items()}
     return unpacked
 
 
-def serialize(val: Any) -> str:
-    return ormsgpack.packb(
+# ormsgpack encodes UUIDs as strings, and dataclasses and Enums as their
+# values, unless told to pass them through to `ormsgpack_serialize_defaults`.
+PACK_OPTIONS = (
+    ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_UUID
+    | ormsgpack.OPT_PASSTHROUGH_DATACLASS
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+)
+
+
+def serialize(val: Any) -> bytes:
+    packed: bytes = ormsgpack.packb(
         val,
         default=ormsgpack_serialize_defaults,
-        option=ormsgpack.OPT_PASSTHROUGH_DATETIME,
+        option=PACK_OPTIONS,
     )
+    if metrics.RECORDER is not None and isinstance(val, Serializable):
+        metrics.RECORDER.record_size(type(val), metrics.ENCODE, len(packed))
+    return packed
+
+
+def _header(length: int, fix: int, marker16: bytes, marker32: bytes) -> bytes:
+    if length < 16:
+        return bytes((fix | length,))
+    if length < 0x10000:
+        return marker16 + length.to_bytes(2, "big")
+    return marker32 + length.to_bytes(4, "big")
+
+
+def array_header(length: int) -> bytes:
+    "The msgpack header of an array of `length` items, for building one by parts."
+    return _header(length, 0x90, b"\xdc", b"\xdd")
+
+
+def map_header(length: int) -> bytes:
+    "The msgpack header of a map of `length` pairs."
+    return _header(length, 0x80, b"\xde", b"\xdf")
@@ -1,16 +1,56 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
-from datetime import datetime
-from typing import Any, Iterable, List, Set, Type, Union
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from time import perf_counter_ns
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import UUID
 
 import pytz
-from django.db.models import Model, fields
-from django.db.models.fields import DateTimeField, DecimalField, Field, UUIDField
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.db.models import DEFERRED, FileField, Model
+from django.db.models.fields import (
+    BinaryField,
+    BooleanField,
+    CharField,
+    DateField,
+    DateTimeField,
+    DecimalField,
+    DurationField,
+    Field,
+    FloatField,
+    GenericIPAddressField,
+    IntegerField,
+    TextField,
+    TimeField,
+    UUIDField,
+)
+from django.utils.duration import duration_microseconds
+from pytz.tzinfo import BaseTzInfo
 
+from . import metrics
 from .code import Code
-from .registry import get_class
+from .registry import CLASS_TO_ID, ID_TO_CLASS, LOCK, get_class, get_registered_class
+from .relations import Tree, embeddable, freeze, relation_tree
 from .serializable import Serializable
 
 TZ = "__DATETIME__"
@@ -18,8 +58,89 @@ MODEL = "__MODEL__"
 UUID_IDENTIFIER = "__UUID__"
 
 
-TZ_IDX = {tz: idx for idx, tz in enumerate(sorted(pytz.common_timezones))}
-TZ_VAL = {idx: pytz.timezone(tz) for tz, idx in TZ_IDX.items()}
+# Fields whose values msgpack carries as they are, which are assigned straight
+# to the instance when decoding rather than going through `to_python`.
+RAW_FIELDS: Tuple[Type[Field], ...] = (
+    BooleanField,
+    CharField,
+    FloatField,
+    GenericIPAddressField,
+    IntegerField,
+    TextField,
+)
+
+try:
+    from django.db.models import JSONField
+except ImportError:  # Django < 3.1
+    pass
+else:
+    RAW_FIELDS += (JSONField,)
+
+
+def _is_array_field(field: Field) -> bool:
+    # Models with array fields have imported them already; there's no need to
+    # pay for importing psycopg2 otherwise.
+    postgres_fields = sys.modules.get("django.contrib.postgres.fields")
+    return postgres_fields is not None and isinstance(field, postgres_fields.ArrayField)
+
+
+# Encoders of related instances embedded by a relation tree, by model, kind and
+# frozen subtree.
+_TREE_CODECS: Dict[Tuple[type, str, Tuple[Any, ...]], Callable[[Any], Any]] = {}
+# Functions encoding and setting the serialized fields of a model, which the
+# codecs of its subclasses reuse.
+_ENCODE_BLOCKS: Dict[type, Callable[[Any], tuple]] = {}
+_DECODE_BLOCKS: Dict[type, Callable[[Any, Any], None]] = {}
+
+
+@lru_cache(maxsize=None)
+def _zone_names() -> List[str]:
+    return sorted(pytz.common_timezones)
+
+
+class _ZoneIds(Dict[str, int]):
+    "Timezone ids by name, filled on first use."
+
+    filled = False
+
+    def fill(self) -> None:
+        # Threads missing a name while this runs wait for it, rather than
+        # taking the partly filled table for the full one.
+        with LOCK:
+            if not self.filled:
+                self.update((name, idx) for idx, name in enumerate(_zone_names()))
+                self.filled = True
+
+    def __missing__(self, name: str) -> int:
+        self.fill()
+        zone_id = dict.get(self, name)
+        if zone_id is None:
+            raise KeyError(name)
+        return zone_id
+
+
+class _Zones(Dict[int, BaseTzInfo]):
+    "Timezones by id, each loaded on first use."
+
+    def __missing__(self, zone_id: int) -> BaseTzInfo:
+        names = _zone_names()
+        if not isinstance(zone_id, int) or not 0 <= zone_id < len(names):
+            raise KeyError(zone_id)
+        zone = self[zone_id] = pytz.timezone(names[zone_id])
+        return zone
+
+
+# Loading every timezone up front costs around 100ms at import.
+TZ_IDX = _ZoneIds()
+TZ_VAL = _Zones()
+
+
+def load_zones() -> None:
+    "Fill the timezone tables now, rather than on first use."
+    TZ_IDX.fill()
+    for zone_id in range(len(_zone_names())):
+        TZ_VAL[zone_id]  # pylint: disable=pointless-statement
+
 
 logger = logging.getLogger(__name__)
 
@@ -36,116 +157,670 @@ def deserialize_dt(zone_id: int, timestamp: float) -> datetime:
     return datetime.fromtimestamp(timestamp, TZ_VAL[zone_id])
 
 
+def serialize_time(val: time) -> Union[int, str]:
+    "Microseconds since midnight, or ISO format for times with a timezone."
+    if val.tzinfo is not None:
+        return val.isoformat()
+    return ((val.hour * 60 + val.minute) * 60 + val.second) * 1000000 + val.microsecond
+
+
+def deserialize_time(val: Union[int, str]) -> time:
+    if isinstance(val, str):
+        return time.fromisoformat(val)
+    seconds, microsecond = divmod(val, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+
 def deserialize_model(
-    class_id: Union[str, int], serialized_value: List[Any]
+    class_id: Union[str, int],
+    serialized_value: List[Any],
+    registered_only: bool = False,
 ) -> Serializable:
-    ModelClass = get_class(class_id)
+    ModelClass = (
+        get_registered_class(class_id) if registered_only else get_class(class_id)
+    )
+    if registered_only and not issubclass(ModelClass, Model):
+        # Objects unwrap their field values, which may name classes too.
+        return ModelClass.from_tuple(serialized_value, registered_only)  # type: ignore
     return ModelClass.from_tuple(serialized_value)
 
 
-def _build_deserialization_expression(idx: int, field: Field, depth: int = 0) -> Code:
+def is_parent_link(field: Field) -> bool:
+    "Whether `field` links a multi-table inheritance child to its parent."
+    return field.is_relation and field.remote_field.parent_link
+
+
+def wrong_length(ModelClass: Type[Model], val: Any, length: int) -> NoReturn:
+    "Raise for a tuple encoded with other fields than those of `ModelClass`."
+    from .model import SerializationError
+
+    raise SerializationError(
+        f"{ModelClass.__name__} is encoded as {length} values, not {len(val)}; "
+        "the value was encoded with other fields."
+    )
+
+
+def _add_length_check(ModelClass: Type[Model], code: Code) -> None:
+    length = _offset(ModelClass) + len(ModelClass.get_serializer_fields())
+    code.add(f"if len(val) != {length}:")
+    code.add(f"wrong_length(ModelClass, val, {length})")
+    code.end_block()
+    code.add_globals(wrong_length=wrong_length)
+
+
+def _add_parent_links(ModelClass: Type[Model], code: Code) -> None:
+    "Set the parent links of `instance`, which aren't serialized, from its pk."
+    for field in ModelClass._meta.fields:
+        if is_parent_link(field):
+            pk_field = _pk_value_field(field.related_model)
+            code.add(f"instance.{field.attname} = instance.{pk_field.attname}")
+
+
+def coerce_value(field: Field, value: Any) -> Any:
+    "`value` converted by `field.to_python`, for fields given other types."
+    try:
+        return field.to_python(value)
+    except (ValidationError, TypeError, ValueError) as ex:
+        from .model import SerializationError
+
+        raise SerializationError(
+            f"{value!r} is not a valid value of {field.model.__name__}.{field.name}."
+        ) from ex
+
+
+def _pk_value_field(ModelClass: Type[Model]) -> Field:
+    "The field holding the primary key value, following parent links."
+    pk_field: Field = ModelClass._meta.pk
+    while pk_field.is_relation:
+        pk_field = pk_field.target_field
+    return pk_field
+
+
+def _build_deserialization_expression(
+    idx: int, field: Field, depth: int = 0, item: Optional[str] = None
+) -> Code:
+    """
+    Code setting `field` on `instance` from its serialized value, which is
+    `val[idx]` in tuples, or the `item` expression if given.  Related instances
+    are built with `from_tuple`, or `from_dict` when the value is a dict.
+    """
+    item = item or f"val[{idx}]"
     code = Code()
     if field.is_relation:
-        pk_field: Field = field.related_model._meta.pk
-        code.add(f"if val[{idx}]:")
+        pk_field = _pk_value_field(field.related_model)
+        code.add(f"if {item}:")
         if isinstance(pk_field, UUIDField):
-            code.add(f"if isinstance(val[{idx}], bytes):")
-            code.add(f"instance.{field.name}_id = UUID(bytes=val[{idx}])")
+            code.add(f"if isinstance({item}, bytes):")
+            code.add(f"instance.{field.name}_id = UUID(bytes={item})")
             code.add_globals(UUID)
         else:
-            code.add(f"if not isinstance(val[{idx}], (list, tuple)):")
-            code.add(f"instance.{field.name}_id = fields[{idx}].to_python(val[{idx}])")
+            code.add(f"if not isinstance({item}, (list, tuple, dict)):")
+            if isinstance(pk_field, RAW_FIELDS):
+                code.add(f"instance.{field.name}_id = {item}")
+            else:
+                code.add(f"instance.{field.name}_id = fields[{idx}].to_python({item})")
+        code.end_block()
+        code.add("else:")
+        code.add(f"if isinstance({item}, dict):")
+        code.add(
+            f"instance.{field.name} = fields[{idx}].related_model.from_dict({item})"
+        )
         code.end_block()
         code.add("else:")
         code.add(
-            f"instance.{field.name} = fields[{idx}].related_model.from_tuple(val[{idx}])"
+            f"instance.{field.name} = fields[{idx}].related_model.from_tuple({item})"
         )
     else:
         if isinstance(field, UUIDField):
             code.add_globals(UUID)
             code.add(
-                f"instance.{field.name} = UUID(bytes=val[{idx}]) if isinstance(val[{idx}], bytes) else fields[{idx}].to_python(val[{idx}])"
+                f"instance.{field.name} = UUID(bytes={item}) if isinstance({item}, bytes) else fields[{idx}].to_python({item})"
             )
         elif isinstance(field, DateTimeField):
             code.add(f"instance.{field.name} = (")
             code.start_block()
             code.add("None")
-            code.add(f"if val[{idx}] is None else")
-            code.add(f"datetime.fromtimestamp(val[{idx}][1], TZ_VAL[val[{idx}][0]])")
+            code.add(f"if {item} is None else")
+            code.add(f"datetime.fromtimestamp({item}[1], TZ_VAL[{item}[0]])")
             code.outdent()
             code.add(")")
             code.add_globals(datetime=datetime, TZ_VAL=TZ_VAL)
+        elif isinstance(field, RAW_FIELDS + (BinaryField, FileField)):
+            # Files are stored by name, which the descriptor wraps on access.
+            code.add(f"instance.{field.name} = {item}")
+        elif isinstance(field, DecimalField):
+            code.add(
+                f"instance.{field.name} = None if {item} is None else Decimal({item})"
+            )
+            code.add_globals(Decimal=Decimal)
+        elif isinstance(field, DateField):
+            # Older payloads carry dates as ISO strings.
+            code.add(
+                f"instance.{field.name} = date.fromordinal({item}) if isinstance({item}, int) else fields[{idx}].to_python({item})"
+            )
+            code.add_globals(date=date)
+        elif isinstance(field, TimeField):
+            code.add(
+                f"instance.{field.name} = None if {item} is None else deserialize_time({item})"
+            )
+            code.add_globals(deserialize_time=deserialize_time)
+        elif isinstance(field, DurationField):
+            code.add(
+                f"instance.{field.name} = None if {item} is None else timedelta(microseconds={item})"
+            )
+            code.add_globals(timedelta=timedelta)
+        elif _is_array_field(field) and isinstance(field.base_field, RAW_FIELDS):
+            code.add(f"instance.{field.name} = {item}")
         else:
-            code.add(f"instance.{field.name} = fields[{idx}].to_python(val[{idx}])")
+            code.add(f"instance.{field.name} = fields[{idx}].to_python({item})")
     return code
 
 
-def compile_to_tuple_function(ModelClass: Type[Model], serializers_dict: dict) -> None:
-    metadata = ModelClass.Serialize  # pylint: disable=E1101
-    load_related: bool = getattr(metadata, "load_related", False)
+def tree_codec(ModelClass: Type[Model], tree: Tree, nested: str) -> Callable:
+    "The `to_tuple` or `to_dict` of `ModelClass` embedding the relations in `tree`."
+    key = (ModelClass, nested, freeze(tree))
+    if key not in _TREE_CODECS:
+        codecs: Dict[type, Callable] = {}
+        if nested == "to_dict":
+            compile_to_dict_function(ModelClass, codecs, tree=tree)
+        else:
+            compile_to_tuple_function(ModelClass, codecs, tree=tree)
+        _TREE_CODECS[key] = codecs[ModelClass]
+    return _TREE_CODECS[key]
 
-    serializer_fields: List[Field] = ModelClass.get_serializer_fields()
-    pk_only: Set[str] = getattr(metadata, "pk_only", set())
-    # if not field.is_relation or field.name not in pk_only and load_related:
 
+def polymorphic_tree_codec(
+    ModelClass: Type[Model], tree: Tree, nested: str
+) -> Callable:
+    """
+    Like `tree_codec`, for the class of each instance of polymorphic
+    `ModelClass`, so that subclasses keep their own fields.
+    """
+    codecs: Dict[type, Callable] = {}
+
+    def codec(val: Any) -> Any:
+        fn = codecs.get(type(val))
+        if fn is None:
+            with LOCK:
+                fn = codecs[type(val)] = tree_codec(type(val), tree, nested)
+        return fn(val)
+
+    return codec
+
+
+def _build_serialization_expression(
+    field: Field,
+    pk_only: Set[str],
+    code: Code,
+    nested: str = "to_tuple",
+    tree: Optional[Tree] = None,
+) -> str:
+    def null_check(expr: str) -> str:
+        return f"None if val.{field.name} is None else {expr}"
+
+    if isinstance(field, UUIDField):
+        return null_check(f"val.{field.name}.bytes")
+    if isinstance(field, DecimalField):
+        return null_check(f"str(val.{field.name})")
+    if isinstance(field, DateTimeField):
+        code.add_globals(TZ_IDX=TZ_IDX)
+        return null_check(
+            f"(TZ_IDX[val.{field.name}.tzinfo.zone], val.{field.name}.timestamp())"
+        )
+
+    def checked(types: str, expr: str) -> str:
+        # Unsaved instances may hold strings, or other types, as they were given.
+        attr = f"val.{field.name}"
+        field_global = f"_{field.attname}_field"
+        code.add_globals(**{field_global: field}, coerce_value=coerce_value)
+        coerced = f"coerce_value({field_global}, {attr})"
+        return null_check(
+            f"{expr.format(attr)} if isinstance({attr}, {types})"
+            f" else {expr.format(coerced)}"
+        )
+
+    if isinstance(field, DateField):
+        code.add_globals(date=date)
+        return checked("date", "{}.toordinal()")
+    if isinstance(field, TimeField):
+        code.add_globals(time=time, serialize_time=serialize_time)
+        return checked("time", "serialize_time({})")
+    if isinstance(field, DurationField):
+        code.add_globals(
+            timedelta=timedelta, duration_microseconds=duration_microseconds
+        )
+        return checked("timedelta", "duration_microseconds({})")
+    if isinstance(field, BinaryField):
+        # Values read from some databases are memoryviews.
+        code.add_globals(BINARY_TYPES=(bytes, bytearray, memoryview))
+        return checked("BINARY_TYPES", "bytes({})")
+    if isinstance(field, FileField):
+        return f"val.{field.name}.name"
+    if field.is_relation:
+        # Determine if should be serialized or just use id.
+        related_class = field.related_model
+        if isinstance(_pk_value_field(related_class), UUIDField):
+            id_expr = (
+                f"(None if val.{field.name}_id is None else val.{field.name}_id.bytes)"
+            )
+        else:
+            id_expr = f"val.{field.name}_id"
+
+        if tree is not None:
+            # Embedded as configured, and loaded if need be.
+            if field.name not in tree or not embeddable(field):
+                return id_expr
+            codec = f"_{field.name}_{nested}"
+            make_codec = (
+                polymorphic_tree_codec if _offset(related_class) else tree_codec
+            )
+            code.add_globals(
+                **{codec: make_codec(related_class, tree[field.name], nested)}
+            )
+            # Unsaved related instances have no id yet.
+            return (
+                f"{codec}(val.{field.name}) if val.{field.attname} is not None"
+                f" or val._state.fields_cache.get('{field.name}') is not None"
+                " else None"
+            )
+
+        if (
+            field.name in pk_only
+            or field.remote_field.parent_link
+            or not hasattr(related_class, "to_tuple")
+        ):
+            # Parent links would embed the fields of the instance again.
+            return id_expr
+
+        # By now we know that we can and should serialize the value
+        # IF it is there in the cached fields.
+        return f"val.{field.name}.{nested}() if '{field.name}' in val._state.fields_cache else {id_expr}"
+    return f"val.{field.name}"
+
+
+def _offset(ModelClass: Type[Model]) -> int:
+    "Positions before the fields: the class id of polymorphic models."
+    return 1 if getattr(ModelClass.Serialize, "polymorphic", False) else 0
+
+
+def _same_relations(ModelClass: Type[Model], base: Type[Model]) -> bool:
+    try:
+        tree, base_tree = relation_tree(ModelClass), relation_tree(base)
+    except ValueError:
+        return False
+    if tree is None or base_tree is None:
+        return tree is base_tree
+    names = base.serialized_field_names()
+    return {name: sub for name, sub in tree.items() if name in names} == base_tree
+
+
+def layout_base(ModelClass: Type[Model]) -> Optional[Type[Model]]:
+    """
+    The nearest registered ancestor of `ModelClass`, through multi-table
+    inheritance or proxies, whose serialized fields start those of `ModelClass`
+    and are encoded the same way, so that its field blocks can be reused.
+    """
+    fields = ModelClass.get_serializer_fields()
+    for base in ModelClass.__mro__[1:]:
+        if base not in CLASS_TO_ID or not hasattr(base, "get_serializer_fields"):
+            continue
+        if getattr(base, "Serialize", None) is not ModelClass.Serialize:
+            return None
+        base_fields = base.get_serializer_fields()
+        if fields[: len(base_fields)] != base_fields:
+            return None
+        return base if _same_relations(ModelClass, base) else None
+    return None
+
+
+def polymorphic_class(ModelClass: Type[Model], class_id: int) -> Type[Model]:
+    "The subclass of polymorphic `ModelClass` with id `class_id`."
+    klass = ID_TO_CLASS.get(class_id)
+    if klass is None or not issubclass(klass, ModelClass):
+        raise ValueError(f"{class_id!r} is not a subclass of {ModelClass.__name__}.")
+    return klass
+
+
+def encode_block(ModelClass: Type[Model]) -> Callable[[Any], tuple]:
+    "The encoded serialized fields of `ModelClass`, without its class id."
+    if ModelClass not in _ENCODE_BLOCKS:
+        code = Code()
+        fn_name = f"_{ModelClass.__name__}_fields"
+        code.add_globals(ModelClass=ModelClass)
+        code.add(f"def {fn_name}(val):")
+        _add_encoded_fields(ModelClass, code, "return", with_id=False)
+        code.full_outdent()
+        code.add(f"_ENCODE_BLOCKS[ModelClass] = {fn_name}")
+        code.add_globals(_ENCODE_BLOCKS=_ENCODE_BLOCKS)
+        metrics.timed_compile(ModelClass, "encode_block", code.exec)
+    return _ENCODE_BLOCKS[ModelClass]
+
+
+def _add_encoded_fields(
+    ModelClass: Type[Model],
+    code: Code,
+    target: str,
+    with_id: bool = True,
+    tree: Optional[Tree] = None,
+) -> None:
+    """
+    Add `<target> (...)` to `code`, with the class id of polymorphic models if
+    `with_id`, and the fields, reusing the block of the layout base if any.
+    """
+    fields: List[Field] = ModelClass.get_serializer_fields()
+    pk_only: Set[str] = getattr(ModelClass.Serialize, "pk_only", set())
+    parts = []
+    if with_id and _offset(ModelClass):
+        parts.append("(CLASS_ID,)")
+        code.add_globals(CLASS_ID=ModelClass._serializer_id)
+    base = layout_base(ModelClass) if tree is None else None
+    if base is not None:
+        parts.append("BASE_FIELDS(val)")
+        code.add_globals(BASE_FIELDS=encode_block(base))
+        fields = fields[len(base.get_serializer_fields()) :]
+    if tree is None:
+        tree = relation_tree(ModelClass)
+    if not fields:
+        code.add(f"{target} " + " + ".join(parts))
+        return
+    code.add(f"{target} " + "".join(part + " + " for part in parts) + "(")
+    code.start_block()
+    code.add(
+        *(
+            _build_serialization_expression(field, pk_only, code, tree=tree) + ","
+            for field in fields
+        )
+    )
+    code.outdent()
+    code.add(")")
+
+
+def compile_to_tuple_function(
+    ModelClass: Type[Model],
+    serializers_dict: dict,
+    profile: Optional[List[int]] = None,
+    filename: Optional[str] = None,
+    tree: Optional[Tree] = None,
+) -> None:
+    """
+    Generate the `to_tuple` function of `ModelClass` into `serializers_dict`.
+    Polymorphic models start the tuple with their class id.
+
+    :param profile: Compile a profiling build, which adds the nanoseconds spent
+                    on each serialized field to the matching item of this list.
+    :param filename: Write the generated source to this file, so that
+                     tracebacks and profilers can show it.
+    :param tree: The relations to embed, defaults to those configured on
+                 `ModelClass.Serialize`.
+    """
+    recorder = None if profile is not None else metrics.RECORDER
     code = Code()
     fn_name = f"_{ModelClass.__name__}_to_tuple"
     code.add_globals(ModelClass=ModelClass)
     code.add(f"def {fn_name}(val):")
-    code.add("return (")
-    code.start_block()
-    for field in serializer_fields:
+    if profile is not None:
+        # One statement per field, each followed by its timer.
+        serializer_fields: List[Field] = ModelClass.get_serializer_fields()
+        pk_only: Set[str] = getattr(ModelClass.Serialize, "pk_only", set())
+        if tree is None:
+            tree = relation_tree(ModelClass)
+        code.add_globals(_TIMINGS=profile, perf_counter_ns=perf_counter_ns)
+        code.add("_start = perf_counter_ns()")
+        for idx, field in enumerate(serializer_fields):
+            code.add(
+                f"f_{field.attname} = "
+                + _build_serialization_expression(field, pk_only, code, tree=tree)
+            )
+            code.add("_end = perf_counter_ns()")
+            code.add(f"_TIMINGS[{idx}] += _end - _start")
+            code.add("_start = _end")
+        code.add("return (")
+        code.start_block()
+        if _offset(ModelClass):
+            code.add("CLASS_ID,")
+            code.add_globals(CLASS_ID=ModelClass._serializer_id)
+        code.add(*(f"f_{field.attname}," for field in serializer_fields))
+        code.outdent()
+        code.add(")")
+    elif recorder is None:
+        _add_encoded_fields(ModelClass, code, "return", tree=tree)
+    else:
+        code.add("_start = perf_counter_ns()")
+        _add_encoded_fields(ModelClass, code, "result =", tree=tree)
+        code.add("RECORDER.record_encode(ModelClass, perf_counter_ns() - _start)")
+        code.add("return result")
+        code.add_globals(RECORDER=recorder, perf_counter_ns=perf_counter_ns)
+    code.full_outdent()
 
-        def null_check(expr: str) -> str:
-            return f"None if val.{field.name} is None else {expr}"
+    code.add(f"_SERIALIZERS[ModelClass] = {fn_name}")
+    code.add_globals(_SERIALIZERS=serializers_dict)
+    metrics.timed_compile(ModelClass, "to_tuple", lambda: code.exec(filename))
 
-        if isinstance(field, UUIDField):
-            code.add(null_check(f"val.{field.name}.bytes") + ",")
-        elif isinstance(field, DecimalField):
-            code.add(null_check(f"str(val.{field.name})") + ",")
-        elif isinstance(field, DateTimeField):
+
+def decode_block(ModelClass: Type[Model]) -> Callable[[Any, Any], None]:
+    "Sets the serialized fields of `ModelClass` on an instance."
+    if ModelClass not in _DECODE_BLOCKS:
+        code = Code()
+        fn_name = f"_{ModelClass.__name__}_fill"
+        code.add_globals(ModelClass=ModelClass)
+        code.add_globals(UUID)
+        code.add(f"def {fn_name}(instance, val):")
+        _add_decoded_fields(ModelClass, code)
+        code.full_outdent()
+        code.add(f"_DECODE_BLOCKS[ModelClass] = {fn_name}")
+        code.add_globals(_DECODE_BLOCKS=_DECODE_BLOCKS)
+        metrics.timed_compile(ModelClass, "decode_block", code.exec)
+    return _DECODE_BLOCKS[ModelClass]
+
+
+def _add_decoded_fields(ModelClass: Type[Model], code: Code) -> None:
+    "Add statements setting the fields on `instance`, reusing the base's block."
+    fields: List[Field] = ModelClass.get_serializer_fields()
+    offset = _offset(ModelClass)
+    start = 0
+    base = layout_base(ModelClass)
+    if base is not None:
+        code.add("BASE_FILL(instance, val)")
+        code.add_globals(BASE_FILL=decode_block(base))
+        start = len(base.get_serializer_fields())
+    code.add("fields = ModelClass.get_serializer_fields()")
+    code.add(
+        *(
+            _build_deserialization_expression(idx, field, item=f"val[{idx + offset}]")
+            for idx, field in enumerate(fields)
+            if idx >= start
+        )
+    )
+
+
+def _add_polymorphic_dispatch(ModelClass: Type[Model], code: Code, call: str) -> None:
+    "Hand tuples of subclasses of polymorphic models to the subclass."
+    if _offset(ModelClass):
+        code.add("if val[0] != CLASS_ID:")
+        code.add(f"return polymorphic_class(ModelClass, val[0]).{call}")
+        code.end_block()
+        code.add_globals(
+            CLASS_ID=ModelClass._serializer_id, polymorphic_class=polymorphic_class
+        )
+
+
+def compile_from_tuple_function(
+    ModelClass: Type[Model],
+    deserializers_dict: dict,
+    profile: Optional[List[int]] = None,
+    filename: Optional[str] = None,
+) -> None:
+    """
+    Generate the `from_tuple` function of `ModelClass` into `deserializers_dict`.
+    Polymorphic models return an instance of the class whose id starts the
+    tuple, which may be a subclass.
+
+    :param profile: Compile a profiling build, which adds the nanoseconds spent
+                    on each serialized field to the matching item of this list.
+    :param filename: Write the generated source to this file, so that
+                     tracebacks and profilers can show it.
+    """
+    fields: List[Field] = ModelClass.get_serializer_fields()
+    offset = _offset(ModelClass)
+    recorder = None if profile is not None else metrics.RECORDER
+    code = Code()
+    fn_name = f"_{ModelClass.__name__}_from_tuple"
+    code.add_globals(ModelClass=ModelClass)
+    code.add_globals(UUID)
+    code.add(f"def {fn_name}(val):")
+    _add_polymorphic_dispatch(ModelClass, code, "from_tuple(val)")
+    _add_length_check(ModelClass, code)
+    if recorder is not None:
+        code.add("_start = perf_counter_ns()")
+        code.add_globals(RECORDER=recorder, perf_counter_ns=perf_counter_ns)
+    code.add("instance = ModelClass()")
+    if profile is not None:
+        code.add("fields = ModelClass.get_serializer_fields()")
+        code.add_globals(_TIMINGS=profile, perf_counter_ns=perf_counter_ns)
+        code.add("_start = perf_counter_ns()")
+        for idx, field in enumerate(fields):
             code.add(
-                null_check(
-                    f"(TZ_IDX[val.{field.name}.tzinfo.zone], val.{field.name}.timestamp())"
-                    + ","
+                _build_deserialization_expression(
+                    idx, field, item=f"val[{idx + offset}]"
                 )
             )
-            code.add_globals(TZ_IDX=TZ_IDX)
-        elif field.is_relation:
-            # Determine if should be serialized or just use id.
-            related_class = field.related_model
-            if isinstance(related_class._meta.pk, UUIDField):
-                id_expr = f"(None if val.{field.name}_id is None else ('{UUID_IDENTIFIER}', val.{field.name}_id.bytes))"
-            else:
-                id_expr = f"val.{field.name}_id"
+            code.add("_end = perf_counter_ns()")
+            code.add(f"_TIMINGS[{idx}] += _end - _start")
+            code.add("_start = _end")
+    else:
+        _add_decoded_fields(ModelClass, code)
+    _add_parent_links(ModelClass, code)
+    if recorder is not None:
+        code.add("RECORDER.record_decode(ModelClass, perf_counter_ns() - _start)")
+    code.add("return instance")
+    code.full_outdent()
+    code.add(f"_DESERIALIZERS[ModelClass] = {fn_name}")
+    code.add_globals(_DESERIALIZERS=deserializers_dict)
+    metrics.timed_compile(ModelClass, "from_tuple", lambda: code.exec(filename))
+
+
+def _build_related_pk_expression(idx: int, field: Field) -> Code:
+    """
+    Code setting the `<field>_id` of `instance` from `val[idx]`, taking the
+    primary key out of a nested instance rather than building it.
+    """
+    related_class = field.related_model
+    pk_field = _pk_value_field(related_class)
+    code = Code()
+    code.add(f"related = val[{idx}]")
+    if hasattr(related_class, "get_serializer_fields"):
+        pk_idx = related_class.get_serializer_fields().index(pk_field) + _offset(
+            related_class
+        )
+        code.add("if isinstance(related, (list, tuple)):")
+        code.add(f"related = related[{pk_idx}]")
+        code.end_block()
+        code.add("elif isinstance(related, dict):")
+        code.add(f"related = related[{pk_field.name!r}]")
+        code.end_block()
+    if isinstance(pk_field, UUIDField):
+        code.add(
+            f"instance.{field.attname} = UUID(bytes=related) if isinstance(related, bytes) else related"
+        )
+    else:
+        code.add(f"instance.{field.attname} = related")
+    return code
 
-            if field.name in pk_only or not hasattr(related_class, "to_tuple"):
-                code.add(id_expr + ",")
-                continue
 
-            # By now we know that we can and should serialize the value
-            # IF it is there in the cached fields.
+def compile_projected_from_tuple_function(
+    ModelClass: Type[Model], only: FrozenSet[str], deserializers_dict: dict
+) -> None:
+    """
+    Generate a `from_tuple` of `ModelClass` that decodes only the fields named
+    in `only` and the primary key, into `deserializers_dict[ModelClass, only]`.
+    The other fields are left deferred, and relations keep only their `_id`.
+    Instances belong to the database that `ModelClass` is read from, so that
+    `save()` writes only the decoded fields there.
+    """
+    fields: List[Field] = ModelClass.get_serializer_fields()
+    code = Code()
+    fn_name = f"_{ModelClass.__name__}_from_tuple_only"
+    code.add_globals(
+        ModelClass=ModelClass,
+        ONLY=only,
+        DEFERRED_ARGS=(DEFERRED,) * len(ModelClass._meta.concrete_fields),
+        DB=router.db_for_read(ModelClass),
+    )
+    code.add_globals(UUID)
+    code.add(f"def {fn_name}(val):")
+    _add_polymorphic_dispatch(ModelClass, code, "from_tuple_only(val, ONLY)")
+    _add_length_check(ModelClass, code)
+    # Like instances from `QuerySet.only`, which load deferred fields on access,
+    # and save only the loaded ones to the database they were read from.
+    code.add("instance = ModelClass(*DEFERRED_ARGS)")
+    code.add("instance._state.adding = False")
+    code.add("instance._state.db = DB")
+    code.add("fields = ModelClass.get_serializer_fields()")
+    offset = _offset(ModelClass)
+    for idx, field in enumerate(fields):
+        if field.name not in only and not field.primary_key:
+            continue
+        if field.is_relation:
+            code.add(_build_related_pk_expression(idx + offset, field))
+        else:
             code.add(
-                f"val.{field.name}.to_tuple() if '{field.name}' in val._state.fields_cache else {id_expr},"
+                _build_deserialization_expression(
+                    idx, field, item=f"val[{idx + offset}]"
+                )
             )
-        else:
-            code.add(f"val.{field.name},")
+    _add_parent_links(ModelClass, code)
+    code.add("return instance")
+    code.full_outdent()
+    code.add(f"_DESERIALIZERS[ModelClass, ONLY] = {fn_name}")
+    code.add_globals(_DESERIALIZERS=deserializers_dict)
+    metrics.timed_compile(ModelClass, "from_tuple_only", code.exec)
+
+
+def compile_to_dict_function(
+    ModelClass: Type[Model], serializers_dict: dict, tree: Optional[Tree] = None
+) -> None:
+    """
+    Generate the `to_dict` function of `ModelClass` into `serializers_dict`.
+    It encodes the same fields, in the same way, as `to_tuple`, keyed by name.
+    """
+    metadata = ModelClass.Serialize  # pylint: disable=E1101
+    serializer_fields: List[Field] = ModelClass.get_serializer_fields()
+    pk_only: Set[str] = getattr(metadata, "pk_only", set())
+    if tree is None:
+        tree = relation_tree(ModelClass)
 
+    code = Code()
+    fn_name = f"_{ModelClass.__name__}_to_dict"
+    code.add_globals(ModelClass=ModelClass)
+    code.add(f"def {fn_name}(val):")
+    code.add("return {")
+    code.start_block()
+    code.add(
+        *(
+            f"{field.name!r}: "
+            + _build_serialization_expression(field, pk_only, code, "to_dict", tree)
+            + ","
+            for field in serializer_fields
+        )
+    )
     code.outdent()
-    code.add(")")
+    code.add("}")
     code.full_outdent()
 
     code.add(f"_SERIALIZERS[ModelClass] = {fn_name}")
     code.add_globals(_SERIALIZERS=serializers_dict)
-    code.exec()
+    metrics.timed_compile(ModelClass, "to_dict", code.exec)
 
 
-def compile_from_tuple_function(
+def compile_from_dict_function(
     ModelClass: Type[Model], deserializers_dict: dict
 ) -> None:
+    "Generate the `from_dict` function of `ModelClass` into `deserializers_dict`."
     fields: List[Field] = ModelClass.get_serializer_fields()
     code = Code()
-    fn_name = f"_{ModelClass.__name__}_from_tuple"
+    fn_name = f"_{ModelClass.__name__}_from_dict"
     code.add_globals(ModelClass=ModelClass)
     code.add_globals(UUID)
     code.add(f"def {fn_name}(val):")
@@ -153,12 +828,90 @@ def compile_from_tuple_function(
     code.add("fields = ModelClass.get_serializer_fields()")
     code.add(
         *(
-            _build_deserialization_expression(idx, field)
+            _build_deserialization_expression(idx, field, item=f"val[{field.name!r}]")
             for idx, field in enumerate(fields)
         )
     )
+    _add_parent_links(ModelClass, code)
     code.add("return instance")
     code.full_outdent()
     code.add(f"_DESERIALIZERS[ModelClass] = {fn_name}")
     code.add_globals(_DESERIALIZERS=deserializers_dict)
-    code.exec()
+    metrics.timed_compile(ModelClass, "from_dict", code.exec)
+
+
+def object_fields(klass: type) -> List[Tuple[str, str]]:
+    """
+    The attribute name and constructor argument name of each field of a
+    dataclass, attrs class or NamedTuple.
+    """
+    if dataclasses.is_dataclass(klass):
+        return [
+            (field.name, field.name)
+            for field in dataclasses.fields(klass)
+            if field.init
+        ]
+    if hasattr(klass, "__attrs_attrs__"):
+        return [
+            # attrs strips leading underscores from argument names.
+            (
+                attribute.name,
+                getattr(attribute, "alias", None) or attribute.name.lstrip("_"),
+            )
+            for attribute in klass.__attrs_attrs__
+            if attribute.init
+        ]
+    if issubclass(klass, tuple) and hasattr(klass, "_fields"):
+        return [(name, name) for name in klass._fields]
+    raise TypeError(f"{klass} is not a dataclass, attrs class, NamedTuple or Enum.")
+
+
+def compile_object_to_tuple_function(klass: type, serializers_dict: dict) -> None:
+    "Generate the `to_tuple` function of a class registered with `serializable`."
+    code = Code()
+    fn_name = f"_{klass.__name__}_to_tuple"
+    code.add_globals(Klass=klass)
+    code.add(f"def {fn_name}(val):")
+    if issubclass(klass, Enum):
+        code.add("return (val.value,)")
+    else:
+        code.add("return (")
+        code.start_block()
+        code.add(*(f"val.{name}," for name, _ in object_fields(klass)))
+        code.outdent()
+        code.add(")")
+    code.full_outdent()
+    code.add(f"_SERIALIZERS[Klass] = {fn_name}")
+    code.add_globals(_SERIALIZERS=serializers_dict)
+    metrics.timed_compile(klass, "to_tuple", code.exec)
+
+
+def compile_object_from_tuple_function(klass: type, deserializers_dict: dict) -> None:
+    """
+    Generate the `from_tuple` function of a class registered with `serializable`.
+    Field values were packed by `serializer.serialize`, so they are unwrapped
+    the same way, passing `registered_only` on.
+    """
+    from .serializer import _unwrap
+
+    code = Code()
+    fn_name = f"_{klass.__name__}_from_tuple"
+    code.add_globals(Klass=klass, _unwrap=_unwrap)
+    code.add(f"def {fn_name}(val, registered_only=False):")
+    if issubclass(klass, Enum):
+        code.add("return Klass(_unwrap(val[0], registered_only))")
+    else:
+        code.add("return Klass(")
+        code.start_block()
+        code.add(
+            *(
+                f"{argument}=_unwrap(val[{idx}], registered_only),"
+                for idx, (_, argument) in enumerate(object_fields(klass))
+            )
+        )
+        code.outdent()
+        code.add(")")
+    code.full_outdent()
+    code.add(f"_DESERIALIZERS[Klass] = {fn_name}")
+    code.add_globals(_DESERIALIZERS=deserializers_dict)
+    metrics.timed_compile(klass, "from_tuple", code.exec)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from .serializer import deserialize, serialize
+
+
+class OrmsgpackSerializer:
+    """
+    Session serializer, enabled with::
+
+        SESSION_SERIALIZER = "django_ormsgpack.sessions.OrmsgpackSerializer"
+
+    Sessions may hold datetimes, UUIDs, Decimals and serializable model
+    instances.  Decoding only builds instances of classes registered with
+    `serializable_model`, and never imports a class named in the payload.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        return serialize(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return deserialize(data, registered_only=True)
@@ -10,6 +10,8 @@ from django.db.models import (
 )
 from django_ormsgpack import serializable_model
 
+from .compat import JSONField
+
 
 @serializable_model
 class ATestModel(Model):
@@ -54,3 +56,63 @@ class Ticket(Model):
 
     class Serialize:
         ...
+
+
+@serializable_model
+class WideModel(Model):
+    id = models.BigAutoField(primary_key=True)
+    char_field = models.CharField(max_length=255)
+    text_field = models.TextField()
+    slug_field = models.SlugField()
+    email_field = models.EmailField()
+    url_field = models.URLField()
+    int_field = models.IntegerField()
+    big_int_field = models.BigIntegerField()
+    small_int_field = models.SmallIntegerField()
+    positive_int_field = models.PositiveIntegerField()
+    float_field = models.FloatField()
+    bool_field = models.BooleanField(default=False)
+    decimal_field = models.DecimalField(max_digits=12, decimal_places=2)
+    datetime_field = models.DateTimeField()
+    date_field = models.DateField()
+    time_field = models.TimeField()
+    uuid_field = models.UUIDField(default=uuid4)
+    ip_field = models.GenericIPAddressField()
+    json_field = JSONField(default=dict)
+    binary_field = models.BinaryField()
+    duration_field = models.DurationField()
+    file_field = models.FileField(blank=True)
+    nullable_char_field = models.CharField(max_length=255, null=True)
+    ticket = models.ForeignKey(Ticket, null=True, on_delete=models.SET_NULL)
+
+    class Serialize:
+        ...
+
+
+@serializable_model
+class Place(Model):
+    name = CharField(max_length=100)
+    address = CharField(max_length=200, blank=True)
+
+    class Serialize:
+        polymorphic = True
+
+
+@serializable_model
+class Restaurant(Place):
+    serves_pizza = models.BooleanField(default=False)
+
+
+@serializable_model
+class CornerShop(Place):
+    class Meta:
+        proxy = True
+
+
+@serializable_model
+class Review(Model):
+    place = models.ForeignKey(Place, on_delete=models.CASCADE)
+    stars = IntegerField()
+
+    class Serialize:
+        ...
@@ -0,0 +1,73 @@
+from decimal import Decimal
+from uuid import UUID
+
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from django_ormsgpack.renderers import (
+    MsgpackParser,
+    MsgpackRenderer,
+    MsgpackStreamingResponse,
+)
+
+from .models import BTestModel, CTestModel, Ticket
+from .serializers import TicketSerializer
+
+
+def sample_tickets(count):
+    "In-memory tickets, so the views can be exercised without a database."
+    now = timezone.now()
+    screening = BTestModel(
+        id=UUID(int=1),
+        char_field="Coolio",
+        date_field=now,
+        decimal_field=Decimal("20.22"),
+        int_field=123,
+        zorg=UUID(int=2),
+    )
+    purchaser = CTestModel(
+        id=1234,
+        char_field="Coolio",
+        date_field=now,
+        decimal_field=Decimal("20.22"),
+        int_field=123,
+        zorg=UUID(int=3),
+    )
+    return [
+        Ticket(
+            id=UUID(int=idx),
+            screening=screening,
+            user=screening,
+            purchaser=purchaser,
+            cnt_feature_views=idx,
+            viewing_open_time=now,
+            viewing_close_time=now,
+        )
+        for idx in range(count)
+    ]
+
+
+class TicketList(APIView):
+    renderer_classes = [JSONRenderer, MsgpackRenderer]
+    parser_classes = [JSONParser, MsgpackParser]
+
+    def get(self, request):
+        tickets = sample_tickets(int(request.GET.get("count", 100)))
+        if request.accepted_renderer.format == "msgpack":
+            return Response(tickets)
+        return Response(TicketSerializer(tickets, many=True).data)
+
+    def post(self, request):
+        if request.content_type == MsgpackParser.media_type:
+            ticket = Ticket.from_dict(request.data)
+            return Response({"id": str(ticket.id)})
+        serializer = TicketSerializer(data=request.data)
+        serializer.is_valid()
+        return Response({"id": request.data["id"]})
+
+
+def ticket_stream(request):
+    return MsgpackStreamingResponse(sample_tickets(int(request.GET.get("count", 100))))
@@ -3,10 +3,36 @@ import pytest
 from random import randint
 from uuid import uuid4
 from decimal import Decimal
+from django.apps import apps
+from django.db import connection
 from django.utils import timezone
 from my_app.models import ATestModel, BTestModel, CTestModel, Ticket
 
 
+@pytest.fixture
+def database(django_db_blocker, tmp_path):
+    """
+    A throwaway SQLite database with the tables of my_app.  The proxies made by
+    serializable_model cannot be migrated, so the tables are created directly.
+    """
+    models = dict.fromkeys(
+        model._meta.concrete_model
+        for model in apps.get_app_config("my_app").get_models()
+    )
+    name = connection.settings_dict["NAME"]
+    with django_db_blocker.unblock():
+        connection.close()
+        connection.settings_dict["NAME"] = str(tmp_path / "db.sqlite3")
+        try:
+            with connection.schema_editor() as editor:
+                for model in models:
+                    editor.create_model(model)
+            yield connection
+        finally:
+            connection.close()
+            connection.settings_dict["NAME"] = name
+
+
 @pytest.fixture
 def pk_uuid():
     return uuid4()
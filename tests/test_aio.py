@@ -0,0 +1,63 @@
+import asyncio
+from threading import current_thread
+
+from django.core.cache import cache
+
+from django_ormsgpack import aio
+from django_ormsgpack.serializer import serialize
+from my_app.models import Ticket
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_set_and_get_many(model_instance, ticket_instance):
+    failed = asyncio.run(
+        aio.aset_many({"aio-a": model_instance, "aio-ticket": ticket_instance})
+    )
+    assert failed == []
+
+    found = asyncio.run(aio.aget_many(["aio-a", "aio-ticket", "aio-missing"]))
+    assert set(found) == {"aio-a", "aio-ticket"}
+    assert found["aio-a"].id == model_instance.id
+    assert found["aio-ticket"].purchaser.id == ticket_instance.purchaser.id
+
+
+def test_set_many_offloaded(model_instance):
+    mapping = {f"aio-bulk-{idx}": model_instance for idx in range(aio.OFFLOAD_COUNT)}
+    assert asyncio.run(aio.aset_many(mapping)) == []
+    assert cache.get("aio-bulk-0") == serialize(model_instance)
+
+
+def test_get_model(ticket_instance):
+    cache.set("aio-get", serialize(ticket_instance))
+    assert asyncio.run(aio.aget_model("aio-get")).id == ticket_instance.id
+    assert asyncio.run(aio.aget_model("aio-nothing", default=1)) == 1
+
+
+def test_large_payload_is_offloaded(monkeypatch):
+    monkeypatch.setattr(aio, "deserialize", lambda val: current_thread().name)
+    assert asyncio.run(aio.adeserialize(b"1234", threshold=4)).startswith(
+        "django_ormsgpack"
+    )
+    assert asyncio.run(aio.adeserialize(b"1234", threshold=5)) == "MainThread"
+
+
+def test_iter_deserialize(ticket_instance):
+    val = serialize([ticket_instance] * 25)
+    items = asyncio.run(collect(aio.aiter_deserialize(val, batch_size=10)))
+    assert len(items) == 25
+    assert all(isinstance(item, Ticket) for item in items)
+
+
+def test_iter_single_value(ticket_instance):
+    items = asyncio.run(collect(aio.aiter_deserialize(serialize(ticket_instance))))
+    assert [item.id for item in items] == [ticket_instance.id]
+
+
+def test_get_iter(ticket_instance):
+    cache.set("aio-iter", serialize([ticket_instance, 1, "x"]))
+    items = asyncio.run(collect(aio.aget_iter("aio-iter")))
+    assert items[0].id == ticket_instance.id
+    assert items[1:] == [1, "x"]
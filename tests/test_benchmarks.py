@@ -0,0 +1,114 @@
+import json
+from os import path
+
+import pytest
+
+from benchmarks.cases import CASES
+from benchmarks.fields import field_matrix, format_matrix
+from benchmarks.runner import compare, run
+from benchmarks.startup import IMPORT_BUDGET_MS, ROOT, best, measure, parse_importtime
+from benchmarks.threads import decode_scaling
+from django_ormsgpack import registry
+from django_ormsgpack.registry import ID_TO_ZDICT
+from my_app.models import WideModel
+
+
+@pytest.fixture
+def restore_dictionaries():
+    dictionaries = ID_TO_ZDICT.copy()
+    yield
+    ID_TO_ZDICT.clear()
+    ID_TO_ZDICT.update(dictionaries)
+
+
+def test_run(restore_dictionaries):
+    results = run(cases=["narrow", "nested_fks"], min_time=0)
+    for case in ("narrow", "nested_fks"):
+        assert set(results["results"][case]) == {
+            "ormsgpack",
+            "ormsgpack_zdict",
+            "pickle",
+            "json",
+        }
+        row = results["results"][case]["ormsgpack"]
+        assert row["encode_ops"] > 0
+        assert row["decode_ops"] > 0
+        assert row["bytes"] < results["results"][case]["pickle"]["bytes"]
+
+
+def test_compare():
+    baseline = {
+        "results": {
+            "narrow": {
+                "ormsgpack": {"encode_ops": 1000, "decode_ops": 1000, "bytes": 80},
+                "pickle": {"encode_ops": 1000, "decode_ops": 1000, "bytes": 450},
+            }
+        }
+    }
+    results = {
+        "results": {
+            "narrow": {
+                "ormsgpack": {"encode_ops": 900, "decode_ops": 700, "bytes": 81},
+                "pickle": {"encode_ops": 10, "decode_ops": 10, "bytes": 900},
+            },
+            "wide": {
+                "ormsgpack": {"encode_ops": 1, "decode_ops": 1, "bytes": 1000},
+            },
+        }
+    }
+    assert compare(results, baseline) == [
+        "narrow/ormsgpack decode_ops: 700 < 1000",
+        "narrow/ormsgpack bytes: 81 > 80",
+    ]
+    assert compare(results, baseline, throughput=False) == [
+        "narrow/ormsgpack bytes: 81 > 80",
+    ]
+
+
+def test_stored_baseline():
+    with open(path.join(ROOT, "benchmarks", "baseline.json")) as f:
+        baseline = json.load(f)
+    assert set(baseline["results"]) == set(CASES)
+    assert compare(baseline, baseline) == []
+
+
+def test_field_matrix():
+    rows = field_matrix(count=10)
+
+    assert [row["field"] for row in rows] == [
+        field.name for field in WideModel.get_serializer_fields()
+    ]
+    assert "DurationField" in format_matrix(rows)
+
+
+def test_parse_importtime():
+    output = """import time: self [us] | cumulative | imported package
+import time:       589 |        589 |   django_ormsgpack.serializable
+import time:      1628 |       2683 | django_ormsgpack.registry
+"""
+    assert parse_importtime(output) == {
+        "django_ormsgpack.serializable": 589,
+        "django_ormsgpack.registry": 1628,
+    }
+
+
+def test_startup():
+    result = measure()
+
+    assert result["zones_loaded_at_boot"] == 0
+    assert "django_ormsgpack.serializer_fns" in result["modules_us"]
+
+
+@pytest.mark.benchmark
+def test_startup_budget():
+    result = best([measure() for _ in range(2)])
+
+    assert result["package_import_ms"] < IMPORT_BUDGET_MS
+
+
+def test_decode_scaling(monkeypatch):
+    monkeypatch.setattr(registry, "_FROZEN", False)
+    rows = decode_scaling(threads=(1, 2), count=10, case="narrow")
+    assert [row["threads"] for row in rows] == [1, 2]
+    assert rows[0]["speedup"] == 1.0
+    assert all(row["ops"] > 0 for row in rows)
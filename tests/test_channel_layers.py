@@ -0,0 +1,171 @@
+import asyncio
+from typing import Any, NamedTuple
+
+import pytest
+
+from django_ormsgpack import serializable
+from django_ormsgpack.channel_layers import (
+    OrmsgpackInMemoryChannelLayer,
+    OrmsgpackLayerMixin,
+    OrmsgpackMessageSerializer,
+)
+from django_ormsgpack.serializer import serialize
+from django_ormsgpack.serializer_fns import MODEL
+
+pytest.importorskip("channels")
+
+
+@serializable
+class Envelope(NamedTuple):
+    content: Any
+
+
+def test_send_and_receive(ticket_instance):
+    layer = OrmsgpackInMemoryChannelLayer()
+
+    async def roundtrip():
+        await layer.send(
+            "tickets", {"type": "ticket.update", "ticket": ticket_instance}
+        )
+        return await layer.receive("tickets")
+
+    message = asyncio.run(roundtrip())
+    assert message["type"] == "ticket.update"
+    assert message["ticket"].id == ticket_instance.id
+    assert message["ticket"].purchaser.id == ticket_instance.purchaser.id
+
+
+def test_group_send_shares_encoding(ticket_instance, monkeypatch):
+    layer = OrmsgpackInMemoryChannelLayer(share_references=True)
+    encoded = []
+    monkeypatch.setattr(
+        "django_ormsgpack.channel_layers.serialize",
+        lambda val: encoded.append(val) or serialize(val),
+    )
+
+    async def broadcast():
+        channels = [await layer.new_channel() for _ in range(3)]
+        for channel in channels:
+            await layer.group_add("watchers", channel)
+        await layer.group_send("watchers", {"type": "t", "ticket": ticket_instance})
+        return [await layer.receive(channel) for channel in channels]
+
+    messages = asyncio.run(broadcast())
+    assert encoded.count(ticket_instance) == 1
+    assert [message["ticket"].id for message in messages] == [ticket_instance.id] * 3
+
+
+def test_shared_references(ticket_instance, monkeypatch):
+    message_serializer = OrmsgpackMessageSerializer(share_references=True)
+    message = {"type": "a", "ticket": ticket_instance}
+    with message_serializer.fan_out(message):
+        first = message_serializer.serialize(message)
+
+        encoded = []
+        monkeypatch.setattr(
+            "django_ormsgpack.channel_layers.serialize",
+            lambda val: encoded.append(val) or serialize(val),
+        )
+        # A copy of the message, as channels_redis makes for each connection.
+        second = message_serializer.serialize(dict(message, __asgi_channel__=["x"]))
+    assert ticket_instance not in encoded
+    assert second.startswith(b"\x83") and first.startswith(b"\x82")
+    assert message_serializer.deserialize(second)["ticket"].id == ticket_instance.id
+
+    # Outside of the fan-out, changes are encoded.
+    ticket_instance.cnt_feature_views = 1
+    third = message_serializer.deserialize(message_serializer.serialize(message))
+    assert third["ticket"].cnt_feature_views == 1
+
+
+def test_group_send_after_change(ticket_instance):
+    layer = OrmsgpackInMemoryChannelLayer(share_references=True)
+
+    async def broadcast_twice():
+        channel = await layer.new_channel()
+        await layer.group_add("watchers", channel)
+        message = {"type": "t", "ticket": ticket_instance}
+        await layer.group_send("watchers", message)
+        ticket_instance.cnt_feature_views = 1
+        await layer.group_send("watchers", message)
+        return [await layer.receive(channel) for _ in range(2)]
+
+    first, second = asyncio.run(broadcast_twice())
+    assert first["ticket"].cnt_feature_views == 12345
+    assert second["ticket"].cnt_feature_views == 1
+
+
+class ReversingCrypter:
+    def __init__(self, ttl):
+        self.ttl = ttl
+
+    def encrypt(self, value):
+        return value[::-1]
+
+    def decrypt(self, value, ttl):
+        assert ttl == self.ttl
+        return value[::-1]
+
+
+@pytest.mark.parametrize("expiry,ttl", [(60, 70), (None, None)])
+def test_encryption(now, expiry, ttl):
+    message_serializer = OrmsgpackMessageSerializer(
+        random_prefix_length=12, expiry=expiry
+    )
+    message_serializer.crypter = ReversingCrypter(ttl)
+    blob = message_serializer.serialize({"type": "a", "now": now})
+    assert blob[12:] == serialize({"type": "a", "now": now})[::-1]
+    assert message_serializer.deserialize(blob) == {"type": "a", "now": now}
+
+
+class KeysLayer:
+    def __init__(self, symmetric_encryption_keys=None, expiry=60):
+        self.expiry = expiry
+
+
+def test_symmetric_encryption_keys(now):
+    pytest.importorskip("cryptography")
+
+    class Layer(OrmsgpackLayerMixin, KeysLayer):
+        pass
+
+    layer = Layer(symmetric_encryption_keys=["old", "new"], expiry=30)
+    assert layer.message_serializer.expiry == 30
+    blob = layer.serialize({"type": "a", "now": now})
+    assert serialize(now) not in blob
+    assert layer.deserialize(blob) == {"type": "a", "now": now}
+    # Messages are encrypted with the first key, and decrypted with any.
+    rotated = Layer(symmetric_encryption_keys=["newer", "old"])
+    assert rotated.deserialize(blob)["now"] == now
+
+
+def test_symmetric_encryption_keys_not_a_list():
+    with pytest.raises(ValueError):
+        OrmsgpackMessageSerializer(symmetric_encryption_keys="secret")
+
+
+def test_registered_only(now):
+    message_serializer = OrmsgpackMessageSerializer(random_prefix_length=12)
+    blob = message_serializer.serialize({"type": "a", "now": now})
+    assert len(blob) == len(serialize({"type": "a", "now": now})) + 12
+    assert message_serializer.deserialize(blob) == {"type": "a", "now": now}
+
+    forged = serialize({"x": [MODEL, "my_app.views.TicketList", []]})
+    with pytest.raises(ValueError):
+        message_serializer.from_bytes(forged)
+
+    nested = serialize({"x": Envelope([MODEL, "my_app.views.TicketList", []])})
+    with pytest.raises(ValueError):
+        message_serializer.from_bytes(nested)
+
+
+def test_redis_serializer_format(ticket_instance):
+    core = pytest.importorskip("channels_redis.core")
+    pytest.importorskip("cryptography")
+
+    layer = core.RedisChannelLayer(
+        serializer_format="ormsgpack", symmetric_encryption_keys=["secret"]
+    )
+    assert isinstance(layer._serializer, OrmsgpackMessageSerializer)
+    blob = layer.serialize({"type": "a", "ticket": ticket_instance})
+    assert layer.deserialize(blob)["ticket"].id == ticket_instance.id
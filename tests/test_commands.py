@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_ormsgpack.management.commands import ormsgpack_stats, ormsgpack_train
+from django_ormsgpack.model import _DESERIALIZERS, _SERIALIZERS
+from django_ormsgpack.registry import CLASS_TO_ID
+from my_app.models import Place, Review
+
+
+@pytest.fixture
+def related_reviews(database, monkeypatch):
+    monkeypatch.setattr(Review.Serialize, "related", ("place",), raising=False)
+    # The test models with a DecimalField lacking decimal_places can't be read
+    # from SQLite.
+    registered = {klass: CLASS_TO_ID[klass] for klass in (Place, Review)}
+    for module in (ormsgpack_stats, ormsgpack_train):
+        monkeypatch.setattr(module, "CLASS_TO_ID", registered)
+    # Compiled again with the relation tree, and then without it.
+    _SERIALIZERS.pop(Review, None)
+    _DESERIALIZERS.pop(Review, None)
+    place = Place.objects.create(name="Lucali")
+    Review.objects.bulk_create(Review(place=place, stars=idx) for idx in range(5))
+    yield
+    _SERIALIZERS.pop(Review, None)
+    _DESERIALIZERS.pop(Review, None)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("ormsgpack_profile", "my_app.Review"),
+        ("ormsgpack_stats",),
+        ("ormsgpack_train", "--output"),
+    ],
+)
+def test_samples_select_related(related_reviews, tmp_path, args):
+    if args[-1] == "--output":
+        args += (str(tmp_path / "dictionaries"),)
+    with CaptureQueriesContext(connection) as queries:
+        call_command(*args, stdout=StringIO())
+
+    # One query for each model sampled, rather than one for each review.
+    assert not [query for query in queries if "WHERE" in query["sql"]]
+    assert any('JOIN "my_app_place"' in query["sql"] for query in queries)
@@ -0,0 +1,122 @@
+import zlib
+from random import randint
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from django_ormsgpack.compression import (
+    RAW,
+    ZDICT,
+    ZDICT_HEADER,
+    ZLIB,
+    deserialize_compressed,
+    load_dictionaries,
+    save_dictionaries,
+    serialize_compressed,
+    train_dictionary,
+)
+from django_ormsgpack.model import SerializationError
+from django_ormsgpack.registry import ID_TO_ZDICT
+from django_ormsgpack.serializer import serialize
+from my_app.models import Ticket
+
+
+def make_ticket(model_b_instance, model_c_instance):
+    return Ticket(
+        id=uuid4(),
+        screening=model_b_instance,
+        user=model_b_instance,
+        purchaser=model_c_instance,
+        cnt_feature_views=randint(0, 100000),
+        cnt_preroll_views=randint(0, 100000),
+        cnt_postroll_views=randint(0, 100000),
+        viewing_open_time=timezone.now(),
+        viewing_close_time=timezone.now(),
+    )
+
+
+@pytest.fixture
+def ticket_dictionary(model_b_instance, model_c_instance):
+    samples = [
+        serialize(make_ticket(model_b_instance, model_c_instance)) for _ in range(200)
+    ]
+    ID_TO_ZDICT[Ticket._serializer_id] = train_dictionary(samples)
+    yield ID_TO_ZDICT[Ticket._serializer_id]
+    del ID_TO_ZDICT[Ticket._serializer_id]
+
+
+def test_small_payload_is_not_compressed():
+    blob = serialize_compressed({"a": 1})
+    assert blob[0] == RAW
+    assert deserialize_compressed(blob) == {"a": 1}
+
+
+def test_zlib_without_dictionary(ticket_instance):
+    blob = serialize_compressed(ticket_instance)
+    assert blob[0] == ZLIB
+    assert deserialize_compressed(blob).id == ticket_instance.id
+
+
+def test_zdict_roundtrip(ticket_dictionary, model_b_instance, model_c_instance):
+    ticket = make_ticket(model_b_instance, model_c_instance)
+    blob = serialize_compressed(ticket)
+    assert blob[0] == ZDICT
+    assert len(blob) < len(serialize(ticket))
+
+    same_ticket = deserialize_compressed(blob)
+    assert same_ticket.id == ticket.id
+    assert same_ticket.cnt_feature_views == ticket.cnt_feature_views
+    assert same_ticket.purchaser.id == ticket.purchaser.id
+
+
+def test_full_window_blobs(ticket_dictionary, ticket_instance):
+    # As compressed before the window was reduced.
+    payload = serialize(ticket_instance)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=ticket_dictionary)
+    header = ZDICT_HEADER.pack(
+        ZDICT, Ticket._serializer_id, zlib.adler32(ticket_dictionary)
+    )
+    blob = header + compressor.compress(payload) + compressor.flush()
+    assert deserialize_compressed(blob).id == ticket_instance.id
+
+
+def test_unknown_dictionary(ticket_dictionary, ticket_instance):
+    blob = serialize_compressed(ticket_instance)
+    del ID_TO_ZDICT[Ticket._serializer_id]
+    with pytest.raises(SerializationError):
+        deserialize_compressed(blob)
+    ID_TO_ZDICT[Ticket._serializer_id] = ticket_dictionary
+
+
+def test_retrained_dictionary(ticket_dictionary, ticket_instance):
+    blob = serialize_compressed(ticket_instance)
+    ID_TO_ZDICT[Ticket._serializer_id] = ticket_dictionary[::-1]
+    with pytest.raises(SerializationError):
+        deserialize_compressed(blob)
+    ID_TO_ZDICT[Ticket._serializer_id] = ticket_dictionary
+
+
+@pytest.mark.parametrize("end", [0, 1, 3, 10, -1])
+def test_truncated(ticket_dictionary, ticket_instance, end):
+    blob = serialize_compressed(ticket_instance)
+    with pytest.raises(SerializationError):
+        deserialize_compressed(blob[:end])
+
+
+def test_corrupt_zlib():
+    with pytest.raises(SerializationError):
+        deserialize_compressed(bytes((ZLIB,)) + b"\xff" * 20)
+
+
+def test_unknown_header():
+    with pytest.raises(SerializationError):
+        deserialize_compressed(b"\x7f\x90")
+
+
+def test_save_load_dictionaries(tmp_path, ticket_dictionary):
+    path = str(tmp_path / "dictionaries.msgpack")
+    save_dictionaries({Ticket._serializer_id: ticket_dictionary}, path)
+    del ID_TO_ZDICT[Ticket._serializer_id]
+    assert load_dictionaries(path) == {Ticket._serializer_id: ticket_dictionary}
+    assert ID_TO_ZDICT[Ticket._serializer_id] == ticket_dictionary
@@ -0,0 +1,82 @@
+import ormsgpack
+import pytest
+
+from benchmarks.cases import make_wide
+from django_ormsgpack import serializer
+from django_ormsgpack.delta import apply_delta, diff, serialize_delta
+from my_app.models import Ticket, WideModel
+
+
+@pytest.fixture
+def updated_ticket(ticket_instance):
+    return Ticket.from_tuple(ticket_instance.to_tuple())
+
+
+def test_counter_delta(ticket_instance, updated_ticket):
+    updated_ticket.cnt_feature_views += 1
+    delta = serialize_delta(ticket_instance, updated_ticket)
+
+    assert ormsgpack.unpackb(delta) == [4, 12346]
+    assert len(delta) < len(ticket_instance.serialize()) // 10
+    result = Ticket.deserialize(apply_delta(ticket_instance.serialize(), delta))
+    assert result.cnt_feature_views == 12346
+    assert result.to_tuple() == updated_ticket.to_tuple()
+
+
+def test_unchanged(ticket_instance, updated_ticket):
+    delta = serialize_delta(ticket_instance, updated_ticket)
+
+    assert ormsgpack.unpackb(delta) == []
+    blob = ticket_instance.serialize()
+    assert apply_delta(blob, delta) == blob
+
+
+def test_nested_delta(ticket_instance, updated_ticket):
+    updated_ticket.purchaser.int_field = 99
+    delta = ormsgpack.unpackb(serialize_delta(ticket_instance, updated_ticket))
+
+    fields = Ticket.get_serializer_fields()
+    idx = [field.name for field in fields].index("purchaser")
+    assert delta[0] == -(idx + 1)
+    assert len(delta) == 2
+    result = Ticket.deserialize(apply_delta(ticket_instance.serialize(), delta))
+    assert result.purchaser.int_field == 99
+
+
+def test_tagged_blob(ticket_instance, updated_ticket):
+    blob = serializer.serialize(ticket_instance)
+    updated_ticket.subscribed = True
+    delta = serialize_delta(blob, updated_ticket)
+
+    result = serializer.deserialize(apply_delta(blob, delta))
+    assert result.subscribed is True
+    assert result.to_tuple() == updated_ticket.to_tuple()
+
+
+def test_raw_blob(ticket_instance, updated_ticket):
+    updated_ticket.cnt_postroll_views = 0
+    delta = serialize_delta(ticket_instance.serialize(), updated_ticket)
+
+    assert len(ormsgpack.unpackb(delta)) == 2
+
+
+def test_different_classes(ticket_instance, model_b_instance):
+    with pytest.raises(TypeError):
+        serialize_delta(ticket_instance, model_b_instance)
+
+
+def test_equal_values_of_other_types():
+    assert diff([[1], 0, "a"], [[True], 0.0, "a"]) == [-1, [0, True], 1, 0.0]
+
+    old = make_wide()
+    old.json_field = {"flags": [1, 0]}
+    new = WideModel.from_tuple(old.to_tuple())
+    new.json_field = {"flags": [True, False]}
+    blob = apply_delta(old.serialize(), serialize_delta(old, new))
+    assert WideModel.deserialize(blob).json_field == {"flags": [True, False]}
+    assert blob == new.serialize()
+
+
+def test_different_lengths():
+    with pytest.raises(ValueError):
+        diff([1, 2, 3], [1, 2])
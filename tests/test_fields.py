@@ -0,0 +1,95 @@
+from datetime import date, time, timedelta, timezone
+
+import pytest
+
+from benchmarks.cases import make_wide
+from django_ormsgpack.model import SerializationError
+from django_ormsgpack.serializer import deserialize, serialize
+from django_ormsgpack.serializer_fns import deserialize_time, serialize_time
+from my_app.models import WideModel
+
+ROUND_TRIPPED = [
+    field.attname
+    for field in WideModel.get_serializer_fields()
+    if field.name not in ("ticket", "file_field")
+]
+
+
+def test_every_field_round_trips():
+    instance = make_wide()
+    result = deserialize(serialize(instance))
+
+    for name in ROUND_TRIPPED:
+        assert getattr(result, name) == getattr(instance, name), name
+    assert result.file_field.name == "uploads/report.pdf"
+    assert result.ticket_id == instance.ticket_id
+
+
+def test_fields_skip_to_python():
+    instance = make_wide()
+    WideModel.compile_codecs()
+    result = WideModel.from_tuple(list(instance.to_tuple()))
+
+    assert type(result.json_field) is dict
+    assert type(result.date_field) is date
+    assert type(result.duration_field) is timedelta
+
+
+def test_nulls_round_trip():
+    instance = make_wide()
+    instance.nullable_char_field = None
+    instance.file_field = None
+    result = deserialize(serialize(instance))
+
+    assert result.nullable_char_field is None
+    assert not result.file_field
+
+
+def test_binary_from_memoryview():
+    instance = make_wide()
+    instance.binary_field = memoryview(b"\x00\x01")
+
+    assert deserialize(serialize(instance)).binary_field == b"\x00\x01"
+
+
+def test_date_from_iso_string():
+    values = list(make_wide().to_tuple())
+    names = [field.name for field in WideModel.get_serializer_fields()]
+    values[names.index("date_field")] = "2021-07-04"
+
+    assert WideModel.from_tuple(values).date_field == date(2021, 7, 4)
+
+
+def test_unsaved_strings():
+    # As given to the constructor, before the database converts them.
+    instance = make_wide()
+    instance.date_field = "2021-01-02"
+    instance.time_field = "12:34:56"
+    instance.duration_field = "1 00:00:05"
+    instance.binary_field = "AAECAw=="
+    result = deserialize(serialize(instance))
+
+    assert result.date_field == date(2021, 1, 2)
+    assert result.time_field == time(12, 34, 56)
+    assert result.duration_field == timedelta(days=1, seconds=5)
+    assert result.binary_field == b"\x00\x01\x02\x03"
+
+
+def test_invalid_value_names_field():
+    instance = make_wide()
+    instance.date_field = "someday"
+    with pytest.raises(SerializationError, match="WideModel.date_field"):
+        instance.serialize()
+
+
+@pytest.mark.parametrize(
+    "val",
+    [
+        time(0, 0),
+        time(23, 59, 59, 999999),
+        time(12, 34, 56, 789),
+        time(12, 34, tzinfo=timezone(timedelta(hours=2))),
+    ],
+)
+def test_time(val):
+    assert deserialize_time(serialize_time(val)) == val
@@ -0,0 +1,127 @@
+import pytest
+
+from django_ormsgpack import serializer
+from django_ormsgpack.model import _SERIALIZERS, SerializationError
+from django_ormsgpack.serializer_fns import (
+    compile_to_dict_function,
+    compile_to_tuple_function,
+    encode_block,
+    layout_base,
+)
+from my_app.models import (
+    ATestModel,
+    BTestModel,
+    CornerShop,
+    CTestModel,
+    Place,
+    Restaurant,
+    Review,
+    Ticket,
+)
+
+
+@pytest.fixture
+def restaurant():
+    return Restaurant(id=3, place_ptr_id=3, name="Luigi's", serves_pizza=True)
+
+
+def test_layout_base():
+    assert layout_base(BTestModel) is ATestModel
+    assert layout_base(CTestModel) is BTestModel
+    assert layout_base(Restaurant) is Place
+    assert layout_base(CornerShop) is Place
+    assert layout_base(ATestModel) is None
+    assert layout_base(Ticket) is None
+
+
+def test_reuses_parent_block(model_b_instance):
+    values = model_b_instance.to_tuple()
+
+    assert _SERIALIZERS[BTestModel].__globals__["BASE_FIELDS"] is encode_block(
+        ATestModel
+    )
+    result = BTestModel.from_tuple(values)
+    assert type(result) is BTestModel
+    assert result.to_tuple() == values
+
+
+def test_parent_link_not_serialized(model_b_instance, model_instance):
+    model_b_instance.atestmodel_ptr_id = model_instance.id
+    model_b_instance._state.fields_cache["atestmodel_ptr"] = model_instance
+
+    values = model_b_instance.to_tuple()
+    assert values == model_instance.to_tuple()
+    assert BTestModel.from_tuple(values).atestmodel_ptr_id == model_instance.id
+
+
+def test_parent_link_set_from_pk(restaurant):
+    assert restaurant.to_tuple() == (Restaurant._serializer_id, 3, "Luigi's", "", True)
+    result = Place.from_tuple(restaurant.to_tuple())
+    assert result.place_ptr_id == 3
+    assert Restaurant.from_dict(restaurant.to_dict()).place_ptr_id == 3
+    assert Restaurant.deserialize(restaurant.serialize(), only=()).place_ptr_id == 3
+
+
+@pytest.mark.parametrize("extra", [(), (3, True)])
+def test_stale_layout(restaurant, extra):
+    # Encoded before parent links were left out, or with other fields.
+    values = restaurant.to_tuple()[:-1] + extra
+    with pytest.raises(SerializationError):
+        Place.from_tuple(values)
+    with pytest.raises(SerializationError):
+        Restaurant.from_tuple_only(values, ())
+
+
+def test_polymorphic(restaurant):
+    values = restaurant.to_tuple()
+    assert values[0] == Restaurant._serializer_id
+
+    result = Place.from_tuple(values)
+    assert type(result) is Restaurant
+    assert result.pk == 3
+    assert result.name == "Luigi's"
+    assert result.serves_pizza is True
+    assert type(Place.deserialize(CornerShop(id=4, name="Spar").serialize())) is (
+        CornerShop
+    )
+    assert type(serializer.deserialize(serializer.serialize(restaurant))) is (
+        Restaurant
+    )
+
+
+def test_polymorphic_relation(restaurant):
+    review = Review(id=1, place=restaurant, stars=5)
+
+    result = Review.from_tuple(review.to_tuple())
+    assert type(result.place) is Restaurant
+    assert result.place.serves_pizza is True
+    assert Review.deserialize(review.serialize(), only=("place",)).place_id == 3
+
+
+def test_polymorphic_relation_in_tree(restaurant):
+    review = Review(id=1, place=restaurant, stars=5)
+    serializers = {}
+    compile_to_tuple_function(Review, serializers, tree={"place": {}})
+
+    result = Review.from_tuple(serializers[Review](review))
+    assert type(result.place) is Restaurant
+    assert result.place.serves_pizza is True
+
+    compile_to_dict_function(Review, serializers, tree={"place": {}})
+    assert serializers[Review](review)["place"]["serves_pizza"] is True
+
+
+def test_polymorphic_projection(restaurant):
+    result = Place.deserialize(restaurant.serialize(), only=("name",))
+
+    assert type(result) is Restaurant
+    assert result.name == "Luigi's"
+    assert "serves_pizza" in result.get_deferred_fields()
+
+
+def test_polymorphic_rejects_other_classes():
+    values = list(Place(id=5, name="Somewhere").to_tuple())
+    values[0] = Ticket._serializer_id
+
+    with pytest.raises(ValueError):
+        Place.from_tuple(values)
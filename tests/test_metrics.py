@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from django_ormsgpack import metrics
+from django_ormsgpack.model import _DESERIALIZERS, _SERIALIZERS
+from django_ormsgpack.registry import LOCK, class_fqname
+from django_ormsgpack.serializer import deserialize, serialize
+from my_app.models import ATestModel, BTestModel, Ticket
+
+
+@pytest.fixture
+def recorder():
+    recorder = metrics.enable()
+    yield recorder
+    metrics.disable()
+
+
+def test_disabled_codecs_are_plain(model_instance):
+    model_instance.to_tuple()
+    assert "RECORDER" not in _SERIALIZERS[ATestModel].__globals__
+
+
+def test_counts_and_sizes(recorder, model_instance):
+    blob = model_instance.serialize()
+    ATestModel.deserialize(blob)
+    ATestModel.deserialize(blob)
+
+    stats = recorder.snapshot()[class_fqname(ATestModel)]
+    assert stats["encode_count"] == 1
+    assert stats["decode_count"] == 2
+    assert stats["encode_ns"] > 0
+    assert stats["decode_ns"] > 0
+    bucket = metrics.size_bucket(len(blob))
+    assert stats["sizes"] == {
+        metrics.ENCODE: {bucket: 1},
+        metrics.DECODE: {bucket: 2},
+    }
+    assert set(stats["compile_ns"]) == {"to_tuple", "from_tuple"}
+
+
+def test_nested_models(recorder, ticket_instance):
+    blob = serialize(ticket_instance)
+    deserialize(blob)
+    stats = recorder.snapshot()
+    bucket = metrics.size_bucket(len(blob))
+    assert stats[class_fqname(Ticket)]["sizes"] == {
+        metrics.ENCODE: {bucket: 1},
+        metrics.DECODE: {bucket: 1},
+    }
+    assert stats[class_fqname(Ticket)]["encode_count"] == 1
+    assert stats[class_fqname(BTestModel)]["encode_count"] == 2
+    assert stats[class_fqname(BTestModel)]["decode_count"] == 2
+
+
+def test_disable_discards_instrumented_codecs(model_instance):
+    metrics.enable()
+    model_instance.to_tuple()
+    assert "RECORDER" in _SERIALIZERS[ATestModel].__globals__
+    metrics.disable()
+    assert ATestModel not in _SERIALIZERS
+    assert ATestModel not in _DESERIALIZERS
+
+
+def test_enable_waits_for_compiles():
+    thread = threading.Thread(target=metrics.enable)
+    with LOCK:  # As held by a thread compiling a codec.
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        assert metrics.RECORDER is None
+    thread.join()
+    assert metrics.RECORDER is not None
+    metrics.disable()
+
+
+def test_size_bucket():
+    assert metrics.size_bucket(0) == 1
+    assert metrics.size_bucket(64) == 64
+    assert metrics.size_bucket(65) == 128
@@ -1,4 +1,3 @@
-from timeit import timeit
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
@@ -119,9 +118,6 @@ def test_serialize_deserialize(model_b_instance, model_c_instance):
     assert len(serialized) < len(dumped) / 3
 
 
-X = 50000
-
-
 def test_larger_deserialization(model_b_instance, model_c_instance, ticket_instance):
     the_value = [
         {
@@ -136,27 +132,9 @@ def test_larger_deserialization(model_b_instance, model_c_instance, ticket_insta
     serialized = serialize(the_value)
     dumped = dumps(the_value)
     assert len(serialized) < len(dumped) / 2
-    fast = timeit(lambda: serialize(the_value), number=X)
-    print(f"FAST: {fast}")
-    slow = timeit(lambda: dumps(the_value), number=X)
-    print(f"SLOW: {slow}")
-    assert fast < slow
-
-
-def test_timings_a(model_instance):
-    fast = timeit(lambda: serialize(model_instance), number=X)
-    print(f"FAST: {fast}")
-    slow = timeit(lambda: dumps(model_instance), number=X)
-    print(f"SLOW: {slow}")
-    assert fast < slow / 3
-
-
-def test_timings_b(model_b_instance):
-    fast = timeit(lambda: serialize(model_b_instance), number=X)
-    print(f"FAST: {fast}")
-    slow = timeit(lambda: dumps(model_b_instance), number=X)
-    print(f"SLOW: {slow}")
-    assert fast < slow / 3
+    same_value = deserialize(serialized)
+    assert same_value[0]["nested"][1].id == model_c_instance.id
+    assert same_value[1].id == ticket_instance.id
 
 
 def test_sizes(model_b_instance, model_instance):
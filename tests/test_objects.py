@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+
+import attr
+import ormsgpack
+
+from django_ormsgpack import serializable
+from django_ormsgpack.registry import CLASS_TO_ID, ID_TO_CLASS
+from django_ormsgpack.serializer import deserialize, serialize
+from my_app.models import ATestModel
+
+
+@serializable
+class Status(Enum):
+    OPEN = "open"
+    CLOSED = "closed"
+
+
+@serializable
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@serializable
+@attr.s(auto_attribs=True)
+class Span:
+    _start: int
+    end: int
+
+
+@serializable
+@dataclass
+class Task:
+    name: str
+    status: Status
+    when: datetime
+    model: Optional[ATestModel] = None
+    points: List[Point] = field(default_factory=list)
+    span: Optional[Span] = None
+
+
+@dataclass
+class Unregistered:
+    a: int
+    status: Status
+
+
+class UnregisteredPoint(NamedTuple):
+    x: int
+
+
+def test_registered():
+    assert CLASS_TO_ID[Task] == Task._serializer_id
+    assert ID_TO_CLASS[Point._serializer_id] is Point
+
+
+def test_enum():
+    assert Status.OPEN.to_tuple() == ("open",)
+    assert deserialize(serialize(Status.CLOSED)) is Status.CLOSED
+
+
+def test_named_tuple():
+    assert deserialize(serialize([Point(1, 2)])) == [Point(1, 2)]
+    assert type(deserialize(serialize(Point(1, 2)))) is Point
+
+
+def test_attrs():
+    span = deserialize(serialize(Span(1, 2)))
+    assert span == Span(1, 2)
+
+
+def test_nested(model_instance, now):
+    task = Task(
+        name="Export",
+        status=Status.OPEN,
+        when=now,
+        model=model_instance,
+        points=[Point(1, 2), Point(3, 4)],
+        span=Span(5, 6),
+    )
+    same_task = deserialize(serialize(task))
+    assert same_task.name == "Export"
+    assert same_task.status is Status.OPEN
+    assert same_task.when == now
+    assert same_task.model.id == model_instance.id
+    assert same_task.points == [Point(1, 2), Point(3, 4)]
+    assert same_task.span == Span(5, 6)
+
+
+def test_unregistered_values_are_encoded_as_before():
+    val = [Unregistered(1, Status.OPEN), UnregisteredPoint(2), UUID(int=1)]
+    assert ormsgpack.unpackb(serialize(val))[:2] == [
+        {"a": 1, "status": ["__MODEL__", Status._serializer_id, ["open"]]},
+        [2],
+    ]
@@ -0,0 +1,155 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+
+from django_ormsgpack import parallel
+from django_ormsgpack.model import _DESERIALIZERS, _SERIALIZERS
+from django_ormsgpack.parallel import (
+    _row_query,
+    _rows,
+    deserialize_many,
+    initialize_worker,
+    serialize_many,
+    serialize_queryset,
+    warm_codecs,
+)
+from django_ormsgpack.serializer import deserialize, serialize
+from my_app.models import ATestModel, Place, Review, Ticket
+
+
+@pytest.fixture
+def tickets(ticket_instance):
+    return [ticket_instance] * 25
+
+
+@pytest.fixture
+def process_pool():
+    # Forked, so that the workers see the database of the `database` fixture.
+    with ProcessPoolExecutor(
+        2,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=initialize_worker,
+    ) as executor:
+        yield executor
+
+
+def _worker_connection():
+    return connection.connection is None, len(parallel._INHERITED_CONNECTIONS)
+
+
+def test_serialize_many_in_process(tickets):
+    assert list(serialize_many(tickets, chunk_size=10)) == [
+        serialize(ticket) for ticket in tickets
+    ]
+
+
+def test_deserialize_many_in_process(model_instance):
+    values = [serialize(model_instance)] * 5 + [serialize(42)]
+    decoded = list(deserialize_many(values, chunk_size=2))
+    assert [val.id for val in decoded[:5]] == [model_instance.id] * 5
+    assert decoded[5] == 42
+
+
+def test_thread_pool_unordered(tickets):
+    with ThreadPoolExecutor(4) as executor:
+        blobs = list(serialize_many(tickets, executor, chunk_size=3, ordered=False))
+    assert sorted(blobs) == sorted(serialize(ticket) for ticket in tickets)
+
+
+def test_process_pool(process_pool, tickets):
+    assert list(serialize_many(range(25), process_pool, chunk_size=10)) == [
+        serialize(val) for val in range(25)
+    ]
+    blobs = [serialize(ticket) for ticket in tickets]
+    decoded = list(deserialize_many(blobs, process_pool, chunk_size=10))
+    assert [ticket.id for ticket in decoded] == [ticket.id for ticket in tickets]
+    assert decoded[0].purchaser.id == tickets[0].purchaser.id
+
+
+def test_process_pool_refuses_instances(process_pool, tickets):
+    with pytest.raises(ValueError):
+        list(serialize_many(tickets, process_pool, chunk_size=10))
+
+
+def test_process_pool_queryset(database):
+    place = Place.objects.create(name="Lucali")
+    Review.objects.bulk_create(Review(place=place, stars=idx) for idx in range(30))
+    queryset = Review.objects.select_related("place").order_by("stars")[3:25]
+    # The parent holds a connection while it reads primary keys.
+    connection.ensure_connection()
+
+    with ProcessPoolExecutor(
+        2,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=initialize_worker,
+    ) as executor:
+        assert executor.submit(_worker_connection).result() == (True, 1)
+        blobs = list(serialize_queryset(queryset, executor, chunk_size=4))
+
+    assert blobs == [serialize(review) for review in queryset]
+    assert [deserialize(blob).stars for blob in blobs] == list(range(3, 25))
+
+
+def test_warm_codecs():
+    _SERIALIZERS.clear()
+    _DESERIALIZERS.clear()
+    warm_codecs()
+    assert ATestModel in _SERIALIZERS
+    assert Ticket in _DESERIALIZERS
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_bounded_chunks_in_flight(ordered):
+    consumed = []
+
+    def values():
+        for idx in range(100):
+            consumed.append(idx)
+            yield idx
+
+    with ThreadPoolExecutor(2) as executor:
+        blobs = serialize_many(
+            values(), executor, chunk_size=1, ordered=ordered, workers=2
+        )
+        next(blobs)
+        # Two chunks for each worker, and the one replacing the first result.
+        assert len(consumed) <= 2 * 2 + 1
+        assert len(list(blobs)) == 99
+
+
+def test_row_query_of_sliced_queryset():
+    queryset = Ticket.objects.select_related("screening").filter(
+        cnt_feature_views__gt=10
+    )[:5]
+    sql = str(_rows(Ticket._meta.label, _row_query(queryset), [uuid4()]).query)
+
+    assert "LIMIT" not in sql
+    assert "cnt_feature_views" in sql and "JOIN" in sql and '"id" IN (' in sql
+
+
+def test_row_query_of_union():
+    with pytest.raises(ValueError):
+        _row_query(Ticket.objects.all().union(Ticket.objects.all()))
+
+
+def test_serialize_queryset(monkeypatch, model_b_instance):
+    pks = [uuid4() for _ in range(4)]
+    tickets = {pk: Ticket(id=pk, screening=model_b_instance) for pk in pks[:3]}
+    monkeypatch.setattr(
+        parallel, "_primary_keys", lambda queryset, chunk_size: iter(pks[::-1])
+    )
+    monkeypatch.setattr(
+        parallel,
+        "_rows",
+        lambda label, query, pks: [tickets[pk] for pk in pks if pk in tickets],
+    )
+
+    with ThreadPoolExecutor(2) as executor:
+        blobs = list(
+            serialize_queryset(Ticket.objects.all()[:4], executor, chunk_size=2)
+        )
+    # Rows deleted since their keys were read are skipped.
+    assert blobs == [serialize(tickets[pk]) for pk in pks[2::-1]]
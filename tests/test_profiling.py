@@ -0,0 +1,31 @@
+from os import path
+
+from django_ormsgpack.model import _SERIALIZERS
+from django_ormsgpack.profiling import profile_fields
+from my_app.models import ATestModel, Ticket
+
+
+def test_profile_fields(tmp_path, model_instance):
+    costs = profile_fields(ATestModel, [model_instance] * 10, str(tmp_path))
+
+    assert {cost.name for cost in costs} == {
+        field.name for field in ATestModel.get_serializer_fields()
+    }
+    assert all(cost.encode_ns > 0 and cost.decode_ns > 0 for cost in costs)
+    assert [cost.total_ns for cost in costs] == sorted(
+        (cost.total_ns for cost in costs), reverse=True
+    )
+    assert path.exists(tmp_path / "ATestModel_to_tuple.py")
+    assert path.exists(tmp_path / "ATestModel_from_tuple.py")
+
+
+def test_profiling_build_is_readable_and_separate(tmp_path, ticket_instance):
+    profile_fields(Ticket, [ticket_instance], str(tmp_path))
+
+    with open(tmp_path / "Ticket_to_tuple.py") as f:
+        source = f.read()
+    assert "f_cnt_feature_views = val.cnt_feature_views\n" in source
+    assert "_TIMINGS[4] += _end - _start" in source
+    assert Ticket not in _SERIALIZERS or (
+        "_TIMINGS" not in _SERIALIZERS[Ticket].__globals__
+    )
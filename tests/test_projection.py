@@ -0,0 +1,86 @@
+import pytest
+from django.test.utils import CaptureQueriesContext
+
+from django_ormsgpack.model import (
+    _PROJECTED_DESERIALIZERS,
+    SerializationProgrammingError,
+)
+from my_app.models import Place, Review, Ticket
+
+
+def test_only_decodes_requested_fields(ticket_instance):
+    result = Ticket.deserialize(
+        ticket_instance.serialize(), only=("cnt_feature_views", "viewing_open_time")
+    )
+
+    assert result.id == ticket_instance.id
+    assert result.cnt_feature_views == 12345
+    assert result.viewing_open_time == ticket_instance.viewing_open_time
+    assert result.get_deferred_fields() == {
+        field.attname
+        for field in Ticket._meta.concrete_fields
+        if field.name not in ("id", "cnt_feature_views", "viewing_open_time")
+    }
+    assert not result._state.adding
+
+
+def test_only_keeps_related_ids(ticket_instance):
+    result = Ticket.deserialize(
+        ticket_instance.serialize(), only=("screening", "purchaser")
+    )
+
+    assert result.screening_id == ticket_instance.screening.id
+    assert result.purchaser_id == ticket_instance.purchaser_id
+    assert "screening" not in result._state.fields_cache
+    assert "purchaser" not in result._state.fields_cache
+
+
+def test_related_ids_without_nesting(ticket_instance):
+    del ticket_instance._state.fields_cache["screening"]
+    blob = ticket_instance.serialize()
+
+    result = Ticket.deserialize(blob, only=("screening",))
+    assert result.screening_id == ticket_instance.screening_id
+    # Parent links are followed to the UUID primary key of the parent.
+    assert Ticket.deserialize(blob).screening_id == ticket_instance.screening_id
+
+
+def test_only_decoder_is_cached(ticket_instance):
+    blob = ticket_instance.serialize()
+    Ticket.deserialize(blob, only=("subscribed",))
+    decoder = _PROJECTED_DESERIALIZERS[Ticket, frozenset(["subscribed"])]
+
+    Ticket.deserialize(blob, only=["subscribed"])
+    assert _PROJECTED_DESERIALIZERS[Ticket, frozenset(["subscribed"])] is decoder
+
+
+def test_deferred_fields_load_on_access(ticket_instance, monkeypatch):
+    result = Ticket.deserialize(ticket_instance.serialize(), only=("subscribed",))
+    loaded = []
+
+    def refresh_from_db(fields=None, **kwargs):
+        loaded.extend(fields)
+        result.cnt_feature_views = 1
+
+    monkeypatch.setattr(result, "refresh_from_db", refresh_from_db)
+
+    assert result.cnt_feature_views == 1
+    assert loaded == ["cnt_feature_views"]
+
+
+def test_only_unknown_field(ticket_instance):
+    with pytest.raises(SerializationProgrammingError):
+        Ticket.deserialize(ticket_instance.serialize(), only=("nope",))
+
+
+def test_save_writes_decoded_fields(database):
+    review = Review.objects.create(place=Place.objects.create(name="Lucali"), stars=3)
+    result = Review.deserialize(review.serialize(), only=("stars",))
+    assert result._state.db == "default"
+
+    result.stars = 5
+    with CaptureQueriesContext(database) as queries:
+        result.save()
+    assert len(queries) == 1
+    assert queries[0]["sql"].startswith('UPDATE "my_app_review" SET "stars" = 5 ')
+    assert Review.objects.get().stars == 5
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from django_ormsgpack import model, registry
+from django_ormsgpack.model import _DESERIALIZERS, _SERIALIZERS, SerializableModel
+from django_ormsgpack.registry import (
+    CLASS_TO_ID,
+    ID_TO_CLASS,
+    class_fqname,
+    freeze,
+    get_class,
+    is_frozen,
+)
+from django_ormsgpack.serializer_fns import TZ_IDX, TZ_VAL
+from my_app.models import ATestModel, Ticket
+
+THREADS = 16
+
+
+@pytest.fixture
+def restore_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_FROZEN", False)
+    classes = ID_TO_CLASS.copy()
+    yield
+    ID_TO_CLASS.clear()
+    ID_TO_CLASS.update(classes)
+
+
+def _counting(monkeypatch, name):
+    calls = []
+    compile_fn = getattr(model, name)
+
+    def compile_slowly(*args):
+        calls.append(args[0])
+        time.sleep(0.01)  # Gives the other threads time to miss the codec.
+        compile_fn(*args)
+
+    monkeypatch.setattr(model, name, compile_slowly)
+    return calls
+
+
+def _in_threads(fn):
+    barrier = threading.Barrier(THREADS)
+    results, errors = [], []
+
+    def work():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as ex:  # pylint: disable=broad-except
+            errors.append(ex)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+def test_codecs_compile_once(monkeypatch, ticket_instance):
+    monkeypatch.delitem(_SERIALIZERS, Ticket, raising=False)
+    monkeypatch.delitem(_DESERIALIZERS, Ticket, raising=False)
+    encodes = _counting(monkeypatch, "compile_to_tuple_function")
+    decodes = _counting(monkeypatch, "compile_from_tuple_function")
+
+    values = _in_threads(ticket_instance.to_tuple)
+    # Once each, along with the codecs of related models that it compiles.
+    assert encodes.count(Ticket) == 1
+    assert len(encodes) == len(set(encodes))
+    assert all(val == values[0] for val in values)
+
+    tickets = _in_threads(lambda: Ticket.from_tuple(values[0]))
+    assert decodes.count(Ticket) == 1
+    assert len(decodes) == len(set(decodes))
+    assert {ticket.cnt_feature_views for ticket in tickets} == {12345}
+
+
+def test_freeze(restore_registry):
+    freeze()
+    assert is_frozen()
+    assert TZ_IDX.filled and len(TZ_VAL) == len(TZ_IDX)
+    for klass in CLASS_TO_ID:
+        if issubclass(klass, SerializableModel) and not klass._meta.abstract:
+            assert klass in _SERIALIZERS and klass in _DESERIALIZERS
+    assert get_class(class_fqname(ATestModel)) is ATestModel
+    assert class_fqname(ATestModel) not in ID_TO_CLASS
+
+
+def test_frozen_decoding_does_not_write(restore_registry, model_instance):
+    freeze()
+    classes = ID_TO_CLASS.copy()
+    decoded = _in_threads(
+        lambda: (
+            get_class("decimal.Decimal"),
+            ATestModel.from_tuple(model_instance.to_tuple()),
+        )
+    )
+    assert all(val[1].id == model_instance.id for val in decoded)
+    assert ID_TO_CLASS == classes
@@ -0,0 +1,94 @@
+import pytest
+
+from benchmarks.cases import make_wide
+from django_ormsgpack.relations import related_paths, relation_tree, select_related
+from django_ormsgpack.serializer_fns import (
+    compile_to_dict_function,
+    compile_to_tuple_function,
+)
+from my_app.models import Ticket, WideModel
+
+SCREENING, USER, PURCHASER = 1, 2, 3
+
+
+def to_tuple(ModelClass, instance, tree=None):
+    serializers = {}
+    compile_to_tuple_function(ModelClass, serializers, tree=tree)
+    return serializers[ModelClass](instance)
+
+
+def test_no_tree_by_default():
+    assert relation_tree(Ticket) is None
+
+
+def test_related_paths(monkeypatch):
+    monkeypatch.setattr(
+        Ticket.Serialize, "related", ("screening", "purchaser"), raising=False
+    )
+
+    assert relation_tree(Ticket) == {"screening": {}, "purchaser": {}}
+
+
+def test_load_related(monkeypatch):
+    monkeypatch.setattr(Ticket.Serialize, "load_related", True, raising=False)
+    monkeypatch.setattr(Ticket.Serialize, "pk_only", ("user",), raising=False)
+
+    # Parent links of the related models are not followed.
+    assert relation_tree(Ticket) == {"screening": {}, "purchaser": {}}
+    monkeypatch.setattr(Ticket.Serialize, "related_depth", 0, raising=False)
+    assert relation_tree(Ticket) == {}
+
+
+def test_bad_path(monkeypatch):
+    monkeypatch.setattr(
+        Ticket.Serialize, "related", ("cnt_feature_views",), raising=False
+    )
+
+    with pytest.raises(ValueError):
+        relation_tree(Ticket)
+
+
+def test_select_related(monkeypatch):
+    assert select_related(Ticket.objects.all()).query.select_related is False
+
+    monkeypatch.setattr(Ticket.Serialize, "related", ("purchaser",), raising=False)
+    query = select_related(Ticket.objects.all()).query
+    assert query.select_related == {"purchaser": {}}
+    assert related_paths({"a": {"b": {}, "c": {}}, "d": {}}) == ["a__b", "a__c", "d"]
+
+
+def test_tree_decides_embedding(ticket_instance):
+    values = to_tuple(Ticket, ticket_instance, {"screening": {}})
+
+    assert values[SCREENING] == ticket_instance.screening.to_tuple()
+    assert values[PURCHASER] == ticket_instance.purchaser_id
+    assert Ticket.from_tuple(values).screening.int_field == 123
+
+
+def test_empty_tree_embeds_nothing(ticket_instance):
+    values = to_tuple(Ticket, ticket_instance, {})
+
+    assert not any(
+        isinstance(values[idx], tuple) for idx in (SCREENING, USER, PURCHASER)
+    )
+
+
+def test_tree_null_relation(ticket_instance):
+    instance = make_wide()
+    instance.ticket = ticket_instance
+    assert to_tuple(WideModel, instance, {"ticket": {}})[-1] == tuple(
+        to_tuple(Ticket, ticket_instance, {})
+    )
+
+    instance.ticket = None
+    assert to_tuple(WideModel, instance, {"ticket": {}})[-1] is None
+
+
+def test_tree_to_dict(ticket_instance):
+    serializers = {}
+    compile_to_dict_function(Ticket, serializers, tree={"screening": {}})
+    values = serializers[Ticket](ticket_instance)
+
+    assert isinstance(values["screening"], dict)
+    assert values["purchaser"] == ticket_instance.purchaser_id
+    assert values["user"] == ticket_instance.user_id
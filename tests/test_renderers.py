@@ -0,0 +1,104 @@
+from uuid import UUID
+
+import ormsgpack
+import pytest
+
+from django_ormsgpack.renderers import (
+    MEDIA_TYPE,
+    TOTAL,
+    MsgpackRenderer,
+    _countable,
+    array_header,
+    render,
+    stream_counted,
+    stream_render,
+)
+from my_app.models import ATestModel, Ticket
+
+pytest.importorskip("rest_framework")
+
+
+def test_to_dict_roundtrip(model_instance):
+    as_dict = model_instance.to_dict()
+    assert set(as_dict) == {field.name for field in ATestModel.get_serializer_fields()}
+    assert list(as_dict.values()) == list(model_instance.to_tuple())
+
+    same = ATestModel.from_dict(ormsgpack.unpackb(ormsgpack.packb(as_dict)))
+    assert same.id == model_instance.id
+    assert same.date_field == model_instance.date_field
+    assert same.decimal_field == model_instance.decimal_field
+
+
+def test_nested_to_dict(ticket_instance):
+    as_dict = ticket_instance.to_dict()
+    assert as_dict["screening"]["id"] == ticket_instance.screening.id.bytes
+    same = Ticket.from_dict(ormsgpack.unpackb(render(ticket_instance)))
+    assert same.purchaser.id == ticket_instance.purchaser.id
+    assert same.cnt_feature_views == ticket_instance.cnt_feature_views
+
+
+@pytest.mark.parametrize("length", [0, 15, 16, 65535, 65536])
+def test_array_header(length):
+    blob = array_header(length) + render(None) * length
+    assert ormsgpack.unpackb(blob) == [None] * length
+
+
+def test_stream_render_refuses_wrong_lengths():
+    assert ormsgpack.unpackb(b"".join(stream_render([1, 2], 2))) == [1, 2]
+    with pytest.raises(ValueError):
+        b"".join(stream_render([1, 2, 3], 2))
+    with pytest.raises(ValueError):
+        b"".join(stream_render([1], 2))
+
+
+@pytest.mark.parametrize("low, high", [(0, None), (2, None), (2, 4), (0, 100)])
+def test_stream_counted(low, high):
+    tickets = [Ticket(id=UUID(int=idx), cnt_feature_views=idx) for idx in range(10)]
+    for ticket in tickets:
+        setattr(ticket, TOTAL, len(tickets))
+    rows = iter(tickets[low:high])
+
+    values = ormsgpack.unpackb(b"".join(stream_counted(rows, low, high)))
+    assert [val["cnt_feature_views"] for val in values] == list(range(10))[low:high]
+    assert ormsgpack.unpackb(b"".join(stream_counted(iter([]), 0, None))) == []
+
+
+def test_countable():
+    assert _countable(Ticket.objects.filter(cnt_feature_views=1)[:3])
+    assert not _countable(Ticket.objects.distinct())
+    assert not _countable(Ticket.objects.values("id"))
+    assert not _countable(Ticket.objects.union(Ticket.objects.all()))
+
+
+def test_renderer(ticket_instance):
+    rendered = MsgpackRenderer().render([ticket_instance, {"x": 1}])
+    assert ormsgpack.unpackb(rendered)[1] == {"x": 1}
+
+
+def test_get(client):
+    response = client.get("/tickets/?count=3", HTTP_ACCEPT=MEDIA_TYPE)
+    assert response["Content-Type"] == MEDIA_TYPE
+    tickets = [Ticket.from_dict(val) for val in ormsgpack.unpackb(response.content)]
+    assert [ticket.cnt_feature_views for ticket in tickets] == [0, 1, 2]
+
+
+def test_post(client, ticket_instance):
+    response = client.post(
+        "/tickets/",
+        render(ticket_instance),
+        content_type=MEDIA_TYPE,
+        HTTP_ACCEPT=MEDIA_TYPE,
+    )
+    assert ormsgpack.unpackb(response.content) == {"id": str(ticket_instance.id)}
+
+
+def test_post_garbage(client):
+    response = client.post("/tickets/", b"\xc1", content_type=MEDIA_TYPE)
+    assert response.status_code == 400
+
+
+def test_stream(client):
+    response = client.get("/tickets/stream/?count=20")
+    assert response["Content-Type"] == MEDIA_TYPE
+    values = ormsgpack.unpackb(b"".join(response.streaming_content))
+    assert [val["cnt_feature_views"] for val in values] == list(range(20))
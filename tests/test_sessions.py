@@ -0,0 +1,66 @@
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+import ormsgpack
+import pytest
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+
+from django_ormsgpack import serializable
+from django_ormsgpack.serializer import deserialize
+from django_ormsgpack.serializer_fns import MODEL
+from django_ormsgpack.sessions import OrmsgpackSerializer
+
+
+@serializable
+class Box(NamedTuple):
+    content: Any
+
+
+@pytest.fixture
+def session_serializer(settings):
+    settings.SESSION_SERIALIZER = "django_ormsgpack.sessions.OrmsgpackSerializer"
+
+
+def test_session_roundtrip(session_serializer, ticket_instance, now):
+    session = SessionStore()
+    session["_auth_user_id"] = "42"
+    session["ticket"] = ticket_instance
+    session["seen"] = now
+    session["token"] = uuid4()
+    session["empty"] = []
+    session.save()
+
+    same_session = SessionStore(session_key=session.session_key)
+    assert same_session["_auth_user_id"] == "42"
+    assert same_session["ticket"].id == ticket_instance.id
+    assert same_session["seen"] == now
+    assert same_session["token"] == session["token"]
+    assert same_session["empty"] == []
+
+
+def test_refuses_unregistered_classes():
+    payload = ormsgpack.packb([MODEL, "os.path.join", []])
+    with pytest.raises(ValueError):
+        OrmsgpackSerializer().loads(payload)
+    with pytest.raises(ValueError):
+        OrmsgpackSerializer().loads(ormsgpack.packb({"x": [MODEL, 1234, []]}))
+
+
+def test_registered_fqn_is_not_imported(model_instance):
+    payload = ormsgpack.packb(
+        [MODEL, "my_app.models.ATestModel", model_instance.to_tuple()]
+    )
+    with pytest.raises(ValueError):
+        OrmsgpackSerializer().loads(payload)
+    assert deserialize(payload).id == model_instance.id
+
+
+def test_refuses_unregistered_classes_nested_in_objects(model_instance):
+    session_serializer = OrmsgpackSerializer()
+    box = session_serializer.loads(session_serializer.dumps(Box(model_instance)))
+    assert box.content.id == model_instance.id
+    payload = ormsgpack.packb(
+        [MODEL, Box._serializer_id, [[MODEL, "os.path.join", []]]]
+    )
+    with pytest.raises(ValueError):
+        OrmsgpackSerializer().loads(payload)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+import pytz
+
+from django_ormsgpack import serializer_fns
+from django_ormsgpack.serializer_fns import TZ_IDX, TZ_VAL, _ZoneIds
+
+
+def test_zone_tables():
+    zone_id = TZ_IDX["Europe/Paris"]
+
+    assert TZ_VAL[zone_id] is pytz.timezone("Europe/Paris")
+    assert TZ_VAL[TZ_IDX["UTC"]] is pytz.utc
+
+
+@pytest.mark.parametrize("zone_id", [-1, 100000, "1"])
+def test_unknown_zone_id(zone_id):
+    with pytest.raises(KeyError):
+        TZ_VAL[zone_id]
+
+
+def test_unknown_zone_name():
+    with pytest.raises(KeyError):
+        TZ_IDX["Nowhere/Special"]
+
+
+class SlowNames(list):
+    "Zone names that take a while to go through."
+
+    def __iter__(self):
+        for idx, name in enumerate(list.__iter__(self)):
+            if idx == 1:
+                time.sleep(0.05)
+            yield name
+
+
+def test_lookup_while_filling(monkeypatch):
+    monkeypatch.setattr(
+        serializer_fns, "_zone_names", lambda: SlowNames(["A/B", "C/D", "E/F"])
+    )
+    zone_ids = _ZoneIds()
+    filling = threading.Thread(target=lambda: zone_ids["A/B"])
+    filling.start()
+    time.sleep(0.01)
+    assert zone_ids["E/F"] == 2
+    filling.join()
@@ -8,3 +8,13 @@ urlpatterns = [
     path("", debug.default_urlconf),
     path("admin/", admin.site.urls),
 ]
+
+try:
+    from my_app import views
+except ImportError:  # Django REST framework is optional.
+    pass
+else:
+    urlpatterns += [
+        path("tickets/", views.TicketList.as_view()),
+        path("tickets/stream/", views.ticket_stream),
+    ]